@@ -0,0 +1,93 @@
+# -------------------------------------------------
+# Solves many small knapsacks at once with NumPy
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------
+
+from maze.itemTable import ItemTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BatchKnapsack:
+    """
+    Solves a batch of independent 0/1 knapsacks in lock-step. All DP rows are stacked into a single
+    (batch x capacity) array and every instance's row is advanced with the same vectorised operations,
+    so the Python overhead is paid once per item index instead of once per instance.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise Exception("BatchKnapsack requires numpy.")
+
+    def solveBatch(self, itemLists: list, capacities: list) -> list:
+        """
+        Solves every instance in the batch.
+
+        @param itemLists: one list of (name, weight, value) per instance. A maze's ItemTable can be passed
+                          instead of a list, in which case its columns are copied in without going
+                          through per-item Python objects
+        @param capacities: the knapsack capacity of each instance
+
+        @return A list with one (cells, weight, value) tuple per instance, in the same order. As in
+                Knapsack.dynamicKnapsack, cells are listed from the last item to the first.
+        """
+        if len(itemLists) != len(capacities):
+            raise Exception("Need exactly one capacity per item list.")
+
+        batch = len(itemLists)
+        if batch == 0:
+            return []
+
+        maxItems = max(len(items) for items in itemLists)
+        maxCapacity = max(capacities)
+
+        # pad shorter instances with weightless, worthless items, which never change a row
+        weights = np.zeros((batch, maxItems), dtype=np.int64)
+        values = np.zeros((batch, maxItems), dtype=np.int64)
+        for b, items in enumerate(itemLists):
+            if isinstance(items, ItemTable):
+                weights[b, :len(items)] = items.weights
+                values[b, :len(items)] = items.values
+                continue
+            for i, item in enumerate(items):
+                weights[b, i] = item[1]
+                values[b, i] = item[2]
+
+        rows = np.arange(batch)[:, None]
+        cols = np.arange(maxCapacity + 1)[None, :]
+
+        # dp[b, c] = best value of instance b with capacity c, using the items processed so far
+        dp = np.zeros((batch, maxCapacity + 1), dtype=np.int64)
+        # taken[i, b, c] is True when item i improved dp[b, c]
+        taken = np.zeros((maxItems, batch, maxCapacity + 1), dtype=bool)
+
+        for i in range(maxItems):
+            # column each cell would read from if item i were added; negative means it doesn't fit
+            source = cols - weights[:, i][:, None]
+            fits = source >= 0
+            candidate = dp[rows, np.maximum(source, 0)] + values[:, i][:, None]
+            improved = fits & (candidate > dp)
+            # the candidates were read from the old row, so each item is used at most once
+            dp = np.where(improved, candidate, dp)
+            taken[i] = improved
+
+        # Backtracking, for every instance at once
+        remaining = np.array(capacities, dtype=np.int64)
+        batchIndex = np.arange(batch)
+        chosen = np.zeros((maxItems, batch), dtype=bool)
+        for i in range(maxItems - 1, -1, -1):
+            chosen[i] = taken[i, batchIndex, remaining]
+            remaining -= np.where(chosen[i], weights[:, i], 0)
+
+        results = []
+        for b, items in enumerate(itemLists):
+            names = items.locations() if isinstance(items, ItemTable) else [item[0] for item in items]
+            selected_items = [names[i] for i in range(len(items) - 1, -1, -1) if chosen[i, b]]
+            selected_weight = int(capacities[b] - remaining[b])
+            results.append((selected_items, selected_weight, int(dp[b, capacities[b]])))
+
+        return results
@@ -0,0 +1,72 @@
+# -------------------------------------------------
+# Knapsack that can be updated one item at a time
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------
+
+
+class IncrementalKnapsack:
+    """
+    0/1 knapsack for items that arrive one at a time, e.g. treasures found while exploring.
+    Only the latest row of the capacity-indexed DP table is kept, so adding an item costs O(capacity).
+    The chosen items are only reconstructed when best() is asked for them.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Constructor.
+
+        @param capacity: the maximum weight the knapsack can hold
+        """
+        self.capacity = capacity
+        # row[c] = best value using the items added so far with capacity c
+        self.row = [0] * (capacity + 1)
+        # items added so far as (cell, weight, value), with taken[i][c] set when item i improved row[c]
+        self.items = []
+        self.taken = []
+        # (cells, weight, value) from the last reconstruction, None when out of date
+        self.selection = None
+
+    def addItem(self, cell, weight: int, value: int):
+        """
+        Adds an item and updates the DP row.
+
+        @param cell: location of the item
+        @param weight: weight of the item
+        @param value: value of the item
+        """
+        row = self.row
+        taken = bytearray(self.capacity + 1)
+        # go downwards so the item is used at most once
+        for c in range(self.capacity, weight - 1, -1):
+            candidate = row[c - weight] + value
+            if candidate > row[c]:
+                row[c] = candidate
+                taken[c] = 1
+
+        self.items.append((cell, weight, value))
+        self.taken.append(taken)
+        self.selection = None
+
+    def optimalValue(self) -> int:
+        """
+        @return The best value achievable with the items added so far, without reconstructing the items.
+        """
+        return self.row[self.capacity]
+
+    def best(self):
+        """
+        @return (cells, weight, value) of the best selection of the items added so far.
+        """
+        if self.selection is None:
+            selected_items, selected_weight = [], 0
+            c = self.capacity
+            for i in range(len(self.items) - 1, -1, -1):
+                if self.taken[i][c]:
+                    cell, weight, _ = self.items[i]
+                    selected_items.append(cell)
+                    selected_weight += weight
+                    c -= weight
+            self.selection = (selected_items, selected_weight, self.row[self.capacity])
+
+        return self.selection
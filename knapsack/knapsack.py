@@ -7,8 +7,42 @@
 # __copyright__ = 'Copyright 2025, RMIT University'
 # -------------------------------------------------
 
-import csv
+import heapq
+import math
+import os
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import sys
+from typing import NamedTuple
 from maze.maze import Maze
+from maze.itemTable import ItemTable
+from knapsack.knapsackCache import KnapsackCache
+from knapsack.knapsackPreprocessor import KnapsackPreprocessor
+from knapsack.tableWriter import TableWriter
+
+# numpy is needed by the threaded solver, and speeds up the value-indexed one
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# smallest capacity slice worth handing to its own thread
+MIN_SLICE = 1 << 16
+# rough speed of a vectorised numpy cell update relative to an interpreted one, for the auto planner
+NUMPY_SPEEDUP = 50
+
+
+class RecursionContext:
+    """
+    Statistics and memo table for a single memoised recursive knapsack solve.
+    """
+
+    def __init__(self):
+        # number of calls made, and how many of them were answered from the memo table
+        self.count = 0
+        self.memoHits = 0
+        # (num_items, capacity) -> (bitmask of chosen items, weight, value)
+        self.memo = {}
 
 
 class Knapsack:
@@ -16,12 +50,21 @@ class Knapsack:
     Base class for the knapsack.
     """
 
-    def __init__(self, capacity: int, knapsackSolver: str):
+    def __init__(self, capacity: int, knapsackSolver: str, epsilon: float = 0.1, preprocess: bool = False,
+                 threads: int = None, tableExport: str = "none", topK: int = 1, cache: KnapsackCache = None):
         """
         Constructor.
 
         @param capacity: the maximum weight the knapsack can hold
-        @param knapsackSolver: the method we wish to use to find optimal knapsack items (recur or dynamic)
+        @param knapsackSolver: the method we wish to use to find optimal knapsack items
+                               (recur, recur-memo, dynamic, value, pareto, approx, threaded, topk
+                               or auto)
+        @param epsilon: allowed relative loss of value for the approx solver
+        @param preprocess: whether to shrink the instance with KnapsackPreprocessor before solving
+        @param threads: number of threads for the threaded solver; defaults to the number of CPUs
+        @param tableExport: how the dynamic and threaded solvers export their DP table (none, csv or npy)
+        @param topK: number of item sets the topk solver returns
+        @param cache: results cache to look solves up in first, usually shared between knapsacks
         """
         # initialise variables
         self.capacity = capacity
@@ -29,35 +72,211 @@ class Knapsack:
         self.optimalWeight = 0
         self.optimalCells = []
         self.knapsackSolver = knapsackSolver
+        # filled in by solveKnapsack when knapsackSolver is "auto"
+        self.plannedSolver = None
+        self.planReason = ""
+        # filled in by the recur and recur-memo solvers
+        self.recursionContext = None
+        # filled in by paretoKnapsack: frontier size after each item
+        self.frontierSizes = []
+        # used by approxKnapsack, which also fills in a certified bound on optimal value - optimalValue
+        self.epsilon = epsilon
+        self.approxGapBound = None
+        # the KnapsackPreprocessor used by the last solve, when preprocess is set
+        self.preprocess = preprocess
+        self.preprocessor = None
+        self.threads = threads if threads is not None else (os.cpu_count() or 1)
+        self.tableExport = tableExport
+        # filled in by topKKnapsack: the topK best item sets as (cells, weight, value), best first
+        self.topK = topK
+        self.candidates = []
+        self.cache = cache
+        # the ItemTable being solved and its list of items, when the items came from one; the numpy
+        # solvers read its weight and value columns instead of the items one at a time
+        self.itemTable = None
+        self.tableItems = None
 
     def solveKnapsack(self, maze: Maze, filename: str):
         """
         Calls the method to calculate the optimal knapsack solution
         @param maze: The maze we are considering
         """
-        map = []
-        # Sort by row (i) first, then column (j)
-        sorted_items = sorted(maze.m_items.items(), key=lambda item: (item[0][0], item[0][1]))
+        # the maze's item table is already sorted by row (i) first, then column (j)
+        table = maze.itemTable()
+        map = table.asList()
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.makeKey(map, self.capacity, self.knapsackSolver, self.cacheSettings())
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.loadResult(cached)
+                return
+
+        self.solveItems(map, filename, table)
 
-        for cell, (weight, value) in sorted_items:
-            map.append([cell, weight, value])
+        if self.cache is not None:
+            self.cache.put(key, self.saveResult())
 
-        if self.knapsackSolver == "recur":
-            self.optimalCells, self.optimalWeight, self.optimalValue = self.recursiveKnapsack(map,
-                                                                                              self.capacity,
-                                                                                              len(map),
-                                                                                              filename)
-        elif self.knapsackSolver == "dynamic":
-            self.optimalCells, self.optimalWeight, self.optimalValue = self.dynamicKnapsack(map,
-                                                                                            self.capacity,
-                                                                                            len(map),
-                                                                                            filename)
+    def solveItems(self, items: list, filename: str = None, table: ItemTable = None):
+        """
+        Solves the knapsack for a list of items, without looking at a maze or the cache.
 
+        @param items: list of (name, weight, value)
+        @param filename: save name for the solver's output files; None writes no files
+        @param table: the ItemTable that items is the list of, if any; the numpy solvers use its columns
+        """
+        self.itemTable = table
+        self.tableItems = items if table is not None else None
+        capacity = self.capacity
+        if self.preprocess:
+            self.preprocessor = KnapsackPreprocessor()
+            items, capacity = self.preprocessor.preprocess(items, capacity)
+
+        if self.knapsackSolver == "auto":
+            self.plannedSolver, self.planReason, scale = self.planKnapsack(items, capacity)
+            # dividing every weight by their gcd (and flooring the capacity) gives the same optimal set
+            scaled = [[cell, weight // scale, value] for cell, weight, value in items]
+            cells, weight, value = self.runSolver(self.plannedSolver, scaled, capacity // scale, filename)
+            weight *= scale
+        else:
+            cells, weight, value = self.runSolver(self.knapsackSolver, items, capacity, filename)
+
+        if self.preprocess:
+            cells, weight, value = self.preprocessor.restore(cells, weight, value)
+            self.candidates = [self.preprocessor.restore(*candidate) for candidate in self.candidates]
+
+        self.optimalCells, self.optimalWeight, self.optimalValue = cells, weight, value
+
+    def cacheSettings(self) -> dict:
+        """
+        @return The settings, other than solver and capacity, that can change the result of a solve.
+        """
+        settings = {'preprocess': self.preprocess}
+        if self.knapsackSolver == "approx":
+            settings['epsilon'] = self.epsilon
+        if self.knapsackSolver == "topk":
+            settings['topK'] = self.topK
+        return settings
+
+    def saveResult(self) -> dict:
+        """
+        @return The result of the last solve in a json serialisable form, for the cache.
+        """
+        return {'cells': [list(cell) for cell in self.optimalCells],
+                'weight': self.optimalWeight,
+                'value': self.optimalValue,
+                'candidates': [[[list(cell) for cell in cells], weight, value]
+                               for cells, weight, value in self.candidates],
+                'approxGapBound': self.approxGapBound,
+                'plannedSolver': self.plannedSolver,
+                'planReason': self.planReason}
+
+    def loadResult(self, result: dict):
+        """
+        Restores a result made by saveResult. Solvers are not run, so no files are written.
+        """
+        self.optimalCells = [tuple(cell) for cell in result['cells']]
+        self.optimalWeight = result['weight']
+        self.optimalValue = result['value']
+        self.candidates = [([tuple(cell) for cell in cells], weight, value)
+                           for cells, weight, value in result['candidates']]
+        self.approxGapBound = result['approxGapBound']
+        self.plannedSolver = result['plannedSolver']
+        self.planReason = result['planReason']
+
+    def runSolver(self, solver: str, items: list, capacity: int, filename: str):
+        """
+        Runs a single knapsack solver by name.
+
+        @param solver: name of the solver (recur, recur-memo, dynamic, value, pareto, approx, threaded or topk)
+        @param items: list of (name, weight, value)
+        @param capacity: the knapsack capacity
+        @param filename: save name passed through to the solver (used for testing)
+
+        @return (cells, weight, value) of the optimal selection.
+        """
+        if solver == "recur":
+            stats = {'count': 0, 'logged': False}
+            result = self.recursiveKnapsack(items, capacity, len(items), filename, stats)
+            # report the call count the same way as recur-memo
+            self.recursionContext = RecursionContext()
+            self.recursionContext.count = stats['count']
+            return result
+        elif solver == "dynamic":
+            return self.dynamicKnapsack(items, capacity, len(items), filename)
+        elif solver == "recur-memo":
+            return self.memoRecursiveKnapsack(items, capacity, len(items), filename)
+        elif solver == "value":
+            return self.valueKnapsack(items, capacity, len(items), filename)
+        elif solver == "pareto":
+            return self.paretoKnapsack(items, capacity, len(items), filename)
+        elif solver == "approx":
+            return self.approxKnapsack(items, capacity, len(items), filename)
+        elif solver == "threaded":
+            return self.threadedKnapsack(items, capacity, len(items), filename)
+        elif solver == "topk":
+            return self.topKKnapsack(items, capacity, len(items), filename)
         else:
             raise Exception("Incorrect Knapsack Solver Used.")
 
+    def planKnapsack(self, items: list, capacity: int):
+        """
+        Estimates the work each exact solver would do on this instance and picks the cheapest.
+        Costs are counted in table cells (or calls, for recursion):
+            recur      - 2^n calls in the worst case
+            recur-memo - two calls per memoised state, with at most min(2^n, n * (capacity / gcd + 1)) states
+            dynamic    - n * (capacity / gcd + 1) cells, after dividing the weights by their gcd
+            value      - n * (sum(values) + 1) cells, at numpy speed plus a fixed cost per item when
+                         numpy is installed
+            pareto     - two reads per frontier state; after i items the frontier holds at most
+                         min(2^i, capacity / gcd + 1, sum of the first i values + 1) states
+            threaded   - the dynamic cells spread over the threads at numpy speed, plus a fixed cost per
+                         item for handing the slices out (only when numpy is installed)
+        Solvers that recurse once per item are skipped when n would hit Python's recursion limit.
+
+        @param items: list of (name, weight, value)
+        @param capacity: the knapsack capacity
+
+        @return (solver name, human readable reason, weight scale factor)
+        """
+        n = len(items)
+        scale = 0
+        for item in items:
+            scale = math.gcd(scale, item[1])
+        if scale == 0:
+            # no items, or only weightless ones
+            scale = 1
+        total_value = sum(item[2] for item in items)
+
+        costs = {}
+        if n < sys.getrecursionlimit() - 50:
+            costs["recur"] = 2 ** n
+            costs["dynamic"] = n * (capacity // scale + 1)
+            costs["recur-memo"] = 2 * min(2 ** n, costs["dynamic"])
+        costs["value"] = n * (total_value + 1)
+        if np is not None:
+            costs["value"] = costs["value"] // NUMPY_SPEEDUP + n * NUMPY_SPEEDUP
+        frontier_bound = 0
+        prefix_value = 0
+        for i, item in enumerate(items):
+            prefix_value += item[2]
+            frontier_bound += min(2 ** min(i, 63), capacity // scale + 1, prefix_value + 1)
+        costs["pareto"] = 2 * frontier_bound
+        if np is not None:
+            slices = max(1, min(self.threads, (capacity // scale + 1) // MIN_SLICE))
+            costs["threaded"] = n * (capacity // scale + 1) // (NUMPY_SPEEDUP * slices) + n * NUMPY_SPEEDUP * slices
+
+        # min() keeps the first of equal costs, so ties go to the solver listed first above
+        solver = min(costs, key=costs.get)
+        estimates = ", ".join(f"{name}={cost}" for name, cost in costs.items())
+        reason = (f"n={n}, capacity={capacity}, sum(values)={total_value}, weight gcd={scale}; "
+                  f"estimated cost {estimates} -> {solver}")
+
+        return solver, reason, scale
+
     def recursiveKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None,
-                          stats={'count': 0, 'logged': False}):
+                          stats: dict = None):
         """
         Recursive 0/1 Knapsack that logs how many times it's been called
         when the base case is first hit.
@@ -66,8 +285,12 @@ class Knapsack:
         @param capacity: current remaining knapsack capacity
         @param num_items: number of items still being considered
         @param filename: where to save call count on first base case (used for testing)
-        @param stats: dict tracking call count and log status (used for testing)
+        @param stats: dict tracking call count and log status (used for testing). Leave as None on the
+                      outermost call so every solve starts counting from zero
         """
+        if stats is None:
+            stats = {'count': 0, 'logged': False}
+
         # Increment call count on every call - feed back into the function on each call for testing
         stats['count'] += 1
 
@@ -106,14 +329,67 @@ class Knapsack:
 
         return L_opt, w_opt, v_opt
 
+    def memoRecursiveKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None,
+                              context: 'RecursionContext' = None):
+        """
+        Recursive 0/1 Knapsack memoised on (num_items, capacity). Chosen sets are kept as integer
+        bitmasks (bit i set = items[i] taken) so no lists are copied while recursing. Picks the same
+        items as recursiveKnapsack.
+
+        @param items: list of (name, weight, value)
+        @param capacity: current remaining knapsack capacity
+        @param num_items: number of items still being considered
+        @param filename: unused, kept so every solver shares the same signature
+        @param context: statistics and memo table for this solve; a fresh one is made if None.
+                        It is also stored as self.recursionContext for inspection afterwards
+        """
+        if context is None:
+            context = RecursionContext()
+        self.recursionContext = context
+        memo = context.memo
+
+        def recurse(n: int, c: int):
+            context.count += 1
+
+            # Base case
+            if c == 0 or n == 0:
+                return 0, 0, 0
+
+            key = (n, c)
+            if key in memo:
+                context.memoHits += 1
+                return memo[key]
+
+            weight = items[n - 1][1]
+            value = items[n - 1][2]
+
+            if weight > c:
+                result = recurse(n - 1, c)
+            else:
+                mask_inc, w_inc, v_inc = recurse(n - 1, c - weight)
+                exc = recurse(n - 1, c)
+                if v_inc + value > exc[2]:
+                    result = (mask_inc | (1 << (n - 1)), w_inc + weight, v_inc + value)
+                else:
+                    result = exc
+
+            memo[key] = result
+            return result
+
+        mask, selected_weight, max_value = recurse(num_items, capacity)
+
+        selected_items = [items[i][0] for i in range(num_items) if mask >> i & 1]
+
+        return selected_items, selected_weight, max_value
+
     def dynamicKnapsack(self, items: list, capacity: int, num_items: int, filename: str):
         """
-        Dynamic 0/1 Knapsack that saves the dynamic programming table as a csv.
+        Dynamic 0/1 Knapsack that can export the dynamic programming table (see tableExport).
 
         @param items: list of (name, weight, value)
         @param capacity: current remaining knapsack capacity
         @param num_items: number of items still being considered
-        @param filename: save name for csv of table (used for testing)
+        @param filename: save name for the exported table (used for testing)
         """
         # Initialize DP table with None
         dp = [[None] * (capacity + 1) for _ in range(num_items + 1)]
@@ -158,26 +434,463 @@ class Knapsack:
             # Move to the previous item
             i -= 1
        
-        # === Save DP Table to CSV ===
-        self.saveCSV(dp, items, capacity, filename)
+        # === Export DP Table, if asked for ===
+        if self.tableExport != "none" and filename:
+            with TableWriter(filename, self.tableExport, capacity, num_items + 1) as writer:
+                writer.writeRow('', dp[0])
+                for i in range(1, num_items + 1):
+                    writer.writeRow(f"({items[i - 1][1]}, {items[i - 1][2]})", dp[i])
+                    # backtracking is done, so rows can go as soon as they are written
+                    dp[i - 1] = None
 
         return selected_items, selected_weight, max_value
 
-    def saveCSV(self, dp: list, items: list, capacity: int, filename: str):
-        with open(filename+".csv", 'w', newline='') as f:
-            writer = csv.writer(f)
+    def valueKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None,
+                      valueLimit: int = None):
+        """
+        Value-indexed 0/1 Knapsack. Instead of the best value for each capacity, the table holds the
+        minimum weight needed to reach each total value, so the work is O(n * sum(values)) and does not
+        depend on the capacity at all. Suited to small values and huge capacities. With numpy each row
+        is one vectorised update and the backtracking table is bit-packed (n * sum(values) / 8 bytes).
 
-            # Header: capacities from 0 to capacity
-            header = [''] + [str(j) for j in range(capacity + 1)]
-            writer.writerow(header)
+        @param items: list of (name, weight, value)
+        @param capacity: current remaining knapsack capacity
+        @param num_items: number of items still being considered
+        @param filename: unused, kept so every solver shares the same signature
+        @param valueLimit: optional upper bound on the optimal value; larger totals are not tracked
+        """
+        total_value = sum(items[i][2] for i in range(num_items))
+        if valueLimit is not None:
+            total_value = min(total_value, valueLimit)
 
-            # First row: dp[0], meaning "no items considered"
-            first_row = [''] + [(val if val is not None else '#') for val in dp[0]]
-            writer.writerow(first_row)
+        if np is not None:
+            minWeight, taken = self.valueRowsNumpy(items, num_items, total_value)
+            # best value whose minimum weight still fits; value 0 always does
+            max_value = int(np.flatnonzero(minWeight <= capacity)[-1])
+
+            def wasTaken(i: int, v: int) -> bool:
+                # rows only cover the values reachable so far; packbits puts the first cell in the top bit
+                return (v >> 3) < len(taken[i]) and bool(taken[i][v >> 3] >> (7 - (v & 7)) & 1)
+        else:
+            minWeight, taken = self.valueRowsPython(items, num_items, total_value)
+            max_value = 0
+            for v in range(total_value, -1, -1):
+                if minWeight[v] <= capacity:
+                    max_value = v
+                    break
+
+            def wasTaken(i: int, v: int) -> bool:
+                return v < len(taken[i]) and taken[i][v] == 1
+
+        # Backtracking
+        selected_items, selected_weight = [], 0
+        v = max_value
+        for i in range(num_items - 1, -1, -1):
+            if v == 0:
+                break
+            if wasTaken(i, v):
+                selected_items.append(items[i][0])  # Add location
+                selected_weight += items[i][1]  # Add weight
+                v -= items[i][2]
+
+        return selected_items, selected_weight, max_value
+
+    def valueRowsPython(self, items: list, num_items: int, total_value: int):
+        """
+        The value-indexed DP one cell at a time, for when numpy is not available.
+
+        @return (minWeight, taken): minWeight[v] is the lightest set of items whose values add up to
+                exactly v (inf if none), and taken[i][v] is 1 when item i was used to reach value v.
+        """
+        INF = float('inf')
+        minWeight = [INF] * (total_value + 1)
+        minWeight[0] = 0
+        taken = []
+
+        reachable = 0
+        for i in range(num_items):
+            weight = items[i][1]
+            value = items[i][2]
+            reachable = min(reachable + value, total_value)
+            row = bytearray(reachable + 1)
+            # go downwards so each item is used at most once
+            for v in range(reachable, value - 1, -1):
+                candidate = minWeight[v - value] + weight
+                if candidate < minWeight[v]:
+                    minWeight[v] = candidate
+                    row[v] = 1
+            taken.append(row)
 
+        return minWeight, taken
+
+    def valueRowsNumpy(self, items: list, num_items: int, total_value: int):
+        """
+        The value-indexed DP with each row updated in one vectorised step. The shifted copy is taken
+        before the row is written, so each item is still used at most once. Which values each item
+        improved is kept as a packed bit row covering only the values reachable so far.
+
+        @return (minWeight, taken): minWeight as an int64 array (unreachable values hold a huge
+                weight), and taken[i] the packed bit row of item i.
+        """
+        weights, values = self.itemColumns(items, num_items)
+        minWeight = np.full(total_value + 1, np.iinfo(np.int64).max // 2, dtype=np.int64)
+        minWeight[0] = 0
+        taken = []
+
+        reachable = 0
+        for i in range(num_items):
+            weight = int(weights[i])
+            value = int(values[i])
+            reachable = min(reachable + value, total_value)
+            improved = np.zeros(reachable + 1, dtype=bool)
+            if value <= reachable:
+                current = minWeight[value:reachable + 1]
+                candidate = minWeight[:reachable + 1 - value] + weight
+                np.less(candidate, current, out=improved[value:])
+                np.minimum(current, candidate, out=current)
+            taken.append(np.packbits(improved))
+
+        return minWeight, taken
+
+    def itemColumns(self, items: list, num_items: int):
+        """
+        @return (weights, values) of the first num_items items as int64 arrays. When items is the list of
+                the ItemTable being solved (no preprocessing or rescaling in between), the table's own
+                columns are returned rather than being read out of the items.
+        """
+        if self.itemTable is not None and items is self.tableItems and np is not None:
+            return self.itemTable.weights[:num_items], self.itemTable.values[:num_items]
+        weights = np.fromiter((items[i][1] for i in range(num_items)), dtype=np.int64, count=num_items)
+        values = np.fromiter((items[i][2] for i in range(num_items)), dtype=np.int64, count=num_items)
+        return weights, values
+
+    def approxKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None):
+        """
+        Approximate 0/1 Knapsack (FPTAS). Values are divided by K = epsilon * LB / n, where LB is a lower
+        bound on the optimal value, and rounded down, and the value-indexed DP is run on the result.
+        Rounding loses less than K per item, so the selection is worth at least (1 - epsilon) of the
+        optimum. The certified bound on (optimal value - returned value) is stored in self.approxGapBound.
+
+        @param items: list of (name, weight, value)
+        @param capacity: current remaining knapsack capacity
+        @param num_items: number of items still being considered
+        @param filename: unused, kept so every solver shares the same signature
+        """
+        if self.epsilon <= 0:
+            raise Exception("Knapsack epsilon must be positive.")
+
+        # items that can never fit only make the scaling coarser
+        fitting = [items[i] for i in range(num_items) if items[i][1] <= capacity]
+        if not fitting:
+            self.approxGapBound = 0
+            return [], 0, 0
+
+        lower, upper = self.greedyBounds(fitting, capacity)
+        scale = self.epsilon * lower / len(fitting)
+
+        if scale <= 1:
+            # values are already small enough to solve exactly
+            self.approxGapBound = 0
+            return self.valueKnapsack(fitting, capacity, len(fitting))
+
+        scaled = [[item[0], item[1], int(item[2] // scale)] for item in fitting]
+        # a scaled total above upper / scale would be worth more than the optimum, so it cannot fit
+        selected_items, selected_weight, _ = self.valueKnapsack(scaled, capacity, len(scaled),
+                                                                valueLimit=int(upper // scale))
+
+        byCell = {item[0]: item for item in fitting}
+        max_value = sum(byCell[cell][2] for cell in selected_items)
+
+        # the optimum loses at most scale per item to rounding, and can never beat the fractional bound
+        self.approxGapBound = min(int(max_value + len(fitting) * scale), upper) - max_value
+
+        return selected_items, selected_weight, max_value
+
+    def greedyBounds(self, items: list, capacity: int):
+        """
+        Bounds the optimal value by filling the knapsack in order of value per unit weight.
+
+        @param items: list of (name, weight, value), each of which fits on its own
+        @param capacity: the knapsack capacity
+
+        @return (lower, upper): lower is the better of the greedy selection and the single most valuable
+                item; upper is the fractional (LP relaxation) optimum, rounded down.
+        """
+        # weightless items first, then by decreasing value density
+        ordered = sorted(items, key=lambda item: item[2] / item[1] if item[1] > 0 else float('inf'),
+                         reverse=True)
+
+        greedy = 0
+        upper = None
+        remaining = capacity
+        for _, weight, value in ordered:
+            if weight <= remaining:
+                remaining -= weight
+                greedy += value
+            elif upper is None:
+                # the first item that doesn't fit is taken fractionally for the upper bound
+                upper = greedy + value * remaining // weight
+        if upper is None:
+            upper = greedy
+
+        lower = max(greedy, max(item[2] for item in items))
+        return lower, upper
+
+    def paretoKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None):
+        """
+        Sparse 0/1 Knapsack that only keeps the Pareto frontier: the (weight, value) states that no other
+        state beats on both weight and value. The frontier is held as two parallel lists sorted by
+        weight (values then strictly increase), and adding an item merges it with a shifted copy of
+        itself in linear time. Each state keeps a back-pointer into the previous frontier for
+        reconstruction. The frontier size after each item is stored in self.frontierSizes.
+
+        @param items: list of (name, weight, value)
+        @param capacity: current remaining knapsack capacity
+        @param num_items: number of items still being considered
+        @param filename: unused, kept so every solver shares the same signature
+        """
+        weights = [0]
+        values = [0]
+        # steps[i] = (index into the previous frontier, whether items[i] was taken) for each state
+        steps = []
+        self.frontierSizes = []
+
+        for i in range(num_items):
+            weight = items[i][1]
+            value = items[i][2]
+            # only the states that still fit once this item is added can be shifted
+            shifted = bisect_right(weights, capacity - weight) if weight <= capacity else 0
+
+            newWeights, newValues, parents, taken = [], [], [], bytearray()
+            a, b = 0, 0
+            best = -1
+            while a < len(weights) or b < shifted:
+                # merge by weight; on equal weight look at the higher value first (exclude wins ties)
+                if b == shifted or (a < len(weights) and
+                                    (weights[a], -values[a]) <= (weights[b] + weight, -(values[b] + value))):
+                    w, v, parent, took = weights[a], values[a], a, 0
+                    a += 1
+                else:
+                    w, v, parent, took = weights[b] + weight, values[b] + value, b, 1
+                    b += 1
+
+                # anything no more valuable than a lighter state is dominated
+                if v > best:
+                    newWeights.append(w)
+                    newValues.append(v)
+                    parents.append(parent)
+                    taken.append(took)
+                    best = v
+
+            weights, values = newWeights, newValues
+            steps.append((parents, taken))
+            self.frontierSizes.append(len(weights))
+
+        # the last state is the most valuable one
+        state = len(weights) - 1
+        max_value = values[state]
+        selected_weight = weights[state]
+
+        # Backtracking
+        selected_items = []
+        for i in range(num_items - 1, -1, -1):
+            parents, taken = steps[i]
+            if taken[state]:
+                selected_items.append(items[i][0])  # Add location
+            state = parents[state]
+
+        return selected_items, selected_weight, max_value
+
+    def threadedKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None):
+        """
+        Capacity-indexed 0/1 Knapsack for very large capacities. Each row update is split into capacity
+        slices that are processed by a thread pool (numpy releases the GIL while it works). Every slice
+        reads only from the previous row and writes only its own part of the next one, so the slices
+        never depend on each other. Which cells each item improved is kept as a packed bit row for
+        backtracking, an eighth of the memory of a full table.
+
+        @param items: list of (name, weight, value)
+        @param capacity: current remaining knapsack capacity
+        @param num_items: number of items still being considered
+        @param filename: save name for the exported table, which is streamed out row by row
+        """
+        if np is None:
+            raise Exception("The threaded knapsack solver requires numpy.")
+
+        cells = capacity + 1
+        numSlices = max(1, min(self.threads, cells // MIN_SLICE))
+        # slice boundaries are multiples of 8 so that every slice packs into whole bytes of the bit row
+        step = -(-cells // numSlices // 8) * 8
+        bounds = [(lo, min(lo + step, cells)) for lo in range(0, cells, step)]
+
+        weights, values = self.itemColumns(items, num_items)
+        prev = np.zeros(cells, dtype=np.int64)
+        nxt = np.empty_like(prev)
+        taken = []
+
+        # rows are streamed out as they are computed, if the table is being exported
+        writer = None
+        if self.tableExport != "none" and filename:
+            writer = TableWriter(filename, self.tableExport, capacity, num_items + 1)
+            writer.writeRow('', prev)
+
+        with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+            for i in range(num_items):
+                weight = int(weights[i])
+                value = int(values[i])
+                packed = np.zeros((cells + 7) // 8, dtype=np.uint8)
+
+                def updateSlice(lo: int, hi: int):
+                    # cells lighter than the item can't take it
+                    start = min(max(lo, weight), hi)
+                    nxt[lo:start] = prev[lo:start]
+                    improved = np.zeros(hi - lo, dtype=bool)
+                    if start < hi:
+                        candidate = prev[start - weight:hi - weight] + value
+                        np.greater(candidate, prev[start:hi], out=improved[start - lo:])
+                        np.maximum(prev[start:hi], candidate, out=nxt[start:hi])
+                    packed[lo // 8:(hi + 7) // 8] = np.packbits(improved)
+
+                # list() waits for every slice and re-raises any error from the threads
+                list(pool.map(lambda bound: updateSlice(*bound), bounds))
+                taken.append(packed)
+                prev, nxt = nxt, prev
+                if writer is not None:
+                    writer.writeRow(f"({weight}, {value})", prev)
+
+        if writer is not None:
+            writer.close()
+
+        max_value = int(prev[capacity])
+
+        # Backtracking
+        selected_items, selected_weight = [], 0
+        c = capacity
+        for i in range(num_items - 1, -1, -1):
+            # packbits stores the first cell of each byte in its highest bit
+            if taken[i][c >> 3] >> (7 - (c & 7)) & 1:
+                selected_items.append(items[i][0])  # Add location
+                selected_weight += items[i][1]  # Add weight
+                c -= items[i][1]
+
+        return selected_items, selected_weight, max_value
+
+    def topKKnapsack(self, items: list, capacity: int, num_items: int, filename: str = None):
+        """
+        k-best 0/1 Knapsack. Each capacity cell keeps a bounded list of the self.topK most valuable
+        distinct item sets that fit in it, stored as (value, -weight, bitmask) so they sort best first.
+        Adding an item merges the cell's own list (sets without the item) with the shifted list from
+        c - weight (sets with it); the two never share a set, so every list stays duplicate free.
+        The best set is returned and all of them are stored in self.candidates, best first.
+
+        @param items: list of (name, weight, value)
+        @param capacity: current remaining knapsack capacity
+        @param num_items: number of items still being considered
+        @param filename: unused, kept so every solver shares the same signature
+        """
+        k = max(1, self.topK)
+        # best[c] = up to k best sets with weight at most c, starting with the empty set
+        best = [[(0, 0, 0)] for _ in range(capacity + 1)]
+
+        for i in range(num_items):
+            weight = items[i][1]
+            value = items[i][2]
+            bit = 1 << i
+            # go downwards so best[c - weight] still holds the sets without item i
+            for c in range(capacity, weight - 1, -1):
+                including = [(v + value, w - weight, mask | bit) for v, w, mask in best[c - weight]]
+                best[c] = heapq.nlargest(k, heapq.merge(best[c], including, reverse=True))
+
+        self.candidates = []
+        for v, w, mask in best[capacity]:
+            cells = [items[i][0] for i in range(num_items) if mask >> i & 1]
+            self.candidates.append((cells, -w, v))
+
+        return self.candidates[0]
+
+    def saveCSV(self, dp: list, items: list, capacity: int, filename: str):
+        """
+        Writes a whole DP table as csv, whatever the tableExport setting.
+
+        @param dp: the table, one list per row
+        @param items: list of (name, weight, value), used to label the rows
+        @param capacity: the knapsack capacity
+        @param filename: save name, without extension
+        """
+        with TableWriter(filename, "csv", capacity, len(dp)) as writer:
+            # First row: dp[0], meaning "no items considered"
+            writer.writeRow('', dp[0])
             # Following rows: each item
             for i in range(1, len(dp)):
-                row_label = f"({items[i - 1][1]}, {items[i - 1][2]})"
-                row = [row_label] + [(val if val is not None else '#') for val in dp[i]]
-                writer.writerow(row)
+                writer.writeRow(f"({items[i - 1][1]}, {items[i - 1][2]})", dp[i])
+
+
+class KnapsackResult(NamedTuple):
+    """
+    Immutable result of solve(). Every field is a tuple or a plain value, so a result can be shared
+    between threads and pickled back from worker processes.
+    """
+    cells: tuple
+    weight: int
+    value: int
+    # solver that actually ran (differs from the one asked for with auto)
+    solver: str
+    # other best sets, for the topk solver; each is (cells, weight, value)
+    candidates: tuple
+    # solver statistics as sorted (name, value) pairs, e.g. calls, memoHits, frontierSizes,
+    # approxGapBound, planReason
+    stats: tuple
+
+    def stat(self, name: str, default=None):
+        """
+        @return The statistic called name, or default if the solver didn't record it.
+        """
+        return dict(self.stats).get(name, default)
+
+
+def solve(items: list, capacity: int, knapsackSolver: str, epsilon: float = 0.1, preprocess: bool = False,
+          threads: int = None, topK: int = 1) -> KnapsackResult:
+    """
+    Solves a knapsack without touching any shared state or files: a private Knapsack is used for the
+    call, no tables or call counts are written and no cache is consulted. Safe to call from many
+    threads or worker processes at once.
+
+    @param items: list of (name, weight, value), or a maze's ItemTable
+    @param capacity: the maximum weight the knapsack can hold
+    @param knapsackSolver: any solver accepted by Knapsack
+    @param epsilon: allowed relative loss of value for the approx solver
+    @param preprocess: whether to shrink the instance with KnapsackPreprocessor first
+    @param threads: number of threads for the threaded solver
+    @param topK: number of item sets the topk solver returns
+
+    @return The result and statistics of the solve.
+    """
+    table = None
+    if isinstance(items, ItemTable):
+        table = items
+        items = table.asList()
+
+    knapsack = Knapsack(capacity, knapsackSolver, epsilon=epsilon, preprocess=preprocess, threads=threads,
+                        topK=topK)
+    knapsack.solveItems(items, table=table)
+
+    stats = {}
+    if knapsack.recursionContext is not None:
+        stats['calls'] = knapsack.recursionContext.count
+        stats['memoHits'] = knapsack.recursionContext.memoHits
+    if knapsack.frontierSizes:
+        stats['frontierSizes'] = tuple(knapsack.frontierSizes)
+    if knapsack.approxGapBound is not None:
+        stats['approxGapBound'] = knapsack.approxGapBound
+    if knapsack.plannedSolver is not None:
+        stats['planReason'] = knapsack.planReason
+    if knapsack.preprocessor is not None:
+        stats['preprocess'] = knapsack.preprocessor.report()
 
+    return KnapsackResult(cells=tuple(knapsack.optimalCells),
+                          weight=knapsack.optimalWeight,
+                          value=knapsack.optimalValue,
+                          solver=knapsack.plannedSolver or knapsackSolver,
+                          candidates=tuple((tuple(cells), weight, value)
+                                           for cells, weight, value in knapsack.candidates),
+                          stats=tuple(sorted(stats.items())))
@@ -0,0 +1,92 @@
+# -------------------------------------------------
+# Cache of knapsack results, shared between solves
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+
+class KnapsackCache:
+    """
+    LRU cache of knapsack results with an optional on-disk tier. Results are keyed by a hash of the
+    sorted (location, weight, value) triples, the capacity, the solver and any settings that change
+    the result, so the same items and capacity are only solved once however the maze around them
+    differs. Share one cache between Knapsack objects to reuse results across a sweep.
+    """
+
+    def __init__(self, maxSize: int = 128, directory: str = None):
+        """
+        Constructor.
+
+        @param maxSize: number of results kept in memory
+        @param directory: folder for the on-disk tier; None keeps results in memory only
+        """
+        self.maxSize = maxSize
+        self.directory = directory
+        self.entries = OrderedDict()
+        # hits counts memory and disk hits together; diskHits is the part that came from disk
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def makeKey(self, items: list, capacity: int, solver: str, settings: dict = None) -> str:
+        """
+        Builds the canonical key of an instance.
+
+        @param items: list of ((row, col), weight, value)
+        @param capacity: the knapsack capacity
+        @param solver: name of the solver
+        @param settings: other options that change the result, e.g. epsilon for approx
+
+        @return A hex digest identifying the instance.
+        """
+        triples = sorted([list(item[0]), item[1], item[2]] for item in items)
+        canonical = json.dumps([triples, capacity, solver, settings or {}], sort_keys=True)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str):
+        """
+        @return The result stored under key, or None if there is none.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        if self.directory is not None:
+            path = os.path.join(self.directory, key + ".json")
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    result = json.load(f)
+                self.remember(key, result)
+                self.hits += 1
+                self.diskHits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict):
+        """
+        Stores a result in memory, and on disk if there is a disk tier.
+
+        @param key: key from makeKey
+        @param result: json serialisable result
+        """
+        self.remember(key, result)
+        if self.directory is not None:
+            with open(os.path.join(self.directory, key + ".json"), "w") as f:
+                json.dump(result, f)
+
+    def remember(self, key: str, result: dict):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
@@ -0,0 +1,115 @@
+# -------------------------------------------------
+# Shrinks a knapsack instance before it is solved
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------
+
+import math
+
+
+class KnapsackPreprocessor:
+    """
+    Reduces a 0/1 knapsack instance without changing its optimal value. The steps, in order, are:
+        1. keep only the most valuable item for each location
+        2. drop items heavier than the capacity
+        3. for each weight w, keep only the floor(capacity / w) most valuable items of that weight,
+           as no selection can hold more of them than that
+        4. if the capacity is at least the total weight left, take everything and leave nothing to solve
+        5. divide the weights and capacity by the gcd of the weights
+    Use preprocess() to reduce the instance, solve the reduced one, then restore() the result.
+    """
+
+    def __init__(self):
+        # cells removed by each step
+        self.removed = {'duplicate': [], 'tooHeavy': [], 'dominated': []}
+        # items that are always taken, as (name, weight, value) with their original weights
+        self.forced = []
+        self.scale = 1
+        self.originalCapacity = 0
+        self.capacity = 0
+
+    def preprocess(self, items: list, capacity: int):
+        """
+        Reduces the instance.
+
+        @param items: list of (name, weight, value)
+        @param capacity: the knapsack capacity
+
+        @return (items, capacity) of the reduced instance, with weights divided by self.scale.
+        """
+        self.originalCapacity = capacity
+
+        # 1. one item per location
+        byLocation = {}
+        for item in items:
+            best = byLocation.get(item[0])
+            if best is None:
+                byLocation[item[0]] = item
+            elif (item[2], -item[1]) > (best[2], -best[1]):
+                self.removed['duplicate'].append(best[0])
+                byLocation[item[0]] = item
+            else:
+                self.removed['duplicate'].append(item[0])
+        # keep the original order of what is left
+        remaining = [item for item in items if byLocation.get(item[0]) is item]
+
+        # 2. items that can never fit
+        fitting = []
+        for item in remaining:
+            if item[1] > capacity:
+                self.removed['tooHeavy'].append(item[0])
+            else:
+                fitting.append(item)
+
+        # 3. same-weight dominance
+        byWeight = {}
+        for item in fitting:
+            byWeight.setdefault(item[1], []).append(item)
+        keep = set()
+        for weight, group in byWeight.items():
+            limit = len(group) if weight == 0 else capacity // weight
+            # stable sort, so equal values keep their original order
+            group = sorted(group, key=lambda item: item[2], reverse=True)
+            for item in group[:limit]:
+                keep.add(item[0])
+            for item in group[limit:]:
+                self.removed['dominated'].append(item[0])
+        reduced = [item for item in fitting if item[0] in keep]
+
+        # 4. everything fits
+        totalWeight = sum(item[1] for item in reduced)
+        if totalWeight <= capacity:
+            self.forced = reduced
+            self.capacity = 0
+            return [], 0
+
+        # 5. gcd scaling
+        scale = 0
+        for item in reduced:
+            scale = math.gcd(scale, item[1])
+        self.scale = max(scale, 1)
+        self.capacity = capacity // self.scale
+
+        return [[item[0], item[1] // self.scale, item[2]] for item in reduced], self.capacity
+
+    def restore(self, cells: list, weight: int, value: int):
+        """
+        Converts the solution of the reduced instance back to the original one.
+
+        @param cells: cells chosen in the reduced instance
+        @param weight: their weight, in reduced units
+        @param value: their value
+
+        @return (cells, weight, value) for the original instance.
+        """
+        return (list(cells) + [item[0] for item in self.forced],
+                weight * self.scale + sum(item[1] for item in self.forced),
+                value + sum(item[2] for item in self.forced))
+
+    def report(self) -> str:
+        """
+        @return A one line summary of what preprocess() removed.
+        """
+        return (f"removed {len(self.removed['duplicate'])} duplicate, {len(self.removed['tooHeavy'])} too heavy "
+                f"and {len(self.removed['dominated'])} dominated items; forced {len(self.forced)} items; "
+                f"capacity {self.originalCapacity} -> {self.capacity} (weight gcd {self.scale})")
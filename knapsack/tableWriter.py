@@ -0,0 +1,77 @@
+# -------------------------------------------------
+# Writes dynamic programming tables to file row by row
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------
+
+import csv
+
+# numpy is only needed for the binary format
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TableWriter:
+    """
+    Streams a capacity-indexed DP table to file one row at a time, so the table does not have to be
+    kept in memory just to be exported. Two formats are supported:
+        csv - the same layout as Knapsack.saveCSV, with '#' for cells that were never filled
+        npy - a numpy .npy file of int64, with -1 for cells that were never filled. Rows that are
+              already int64 numpy arrays are written straight from their buffer without copying
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, filename: str, fmt: str, capacity: int, numRows: int):
+        """
+        Opens the file and writes the header.
+
+        @param filename: save name, without extension
+        @param fmt: csv or npy
+        @param capacity: the knapsack capacity, so each row has capacity + 1 cells
+        @param numRows: number of rows that will be written (needed up front for the npy header)
+        """
+        self.fmt = fmt
+        self.capacity = capacity
+
+        if fmt == "csv":
+            self.file = open(filename + ".csv", 'w', newline='')
+            self.writer = csv.writer(self.file)
+            # Header: capacities from 0 to capacity
+            self.writer.writerow([''] + [str(j) for j in range(capacity + 1)])
+        elif fmt == "npy":
+            if np is None:
+                raise Exception("Exporting tables as npy requires numpy.")
+            self.file = open(filename + ".npy", 'wb')
+            header = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.int64)),
+                      'fortran_order': False,
+                      'shape': (numRows, capacity + 1)}
+            np.lib.format.write_array_header_1_0(self.file, header)
+        else:
+            raise Exception("Incorrect table export format used.")
+
+    def writeRow(self, label: str, row):
+        """
+        Appends one row of the table.
+
+        @param label: row label, only used by csv
+        @param row: list (None for unfilled cells) or numpy array of the capacity + 1 cell values
+        """
+        if self.fmt == "csv":
+            if np is not None and isinstance(row, np.ndarray):
+                row = row.tolist()
+            self.writer.writerow([label] + [(val if val is not None else '#') for val in row])
+        else:
+            if not (isinstance(row, np.ndarray) and row.dtype == np.int64):
+                row = np.array([val if val is not None else -1 for val in row], dtype=np.int64)
+            self.file.write(memoryview(np.ascontiguousarray(row)))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,206 @@
+# -------------------------------------------------------------------
+# Two level (HPA* style) index for shortest paths in large mazes: the
+# grid is cut into blocks and searched block to block before the path
+# is filled in locally.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+from collections import deque
+import heapq
+
+from typing import List, Dict, Optional
+
+
+class HierarchicalIndex:
+    """
+    The grid is partitioned into blockSize x blockSize blocks (the boundary cells of the maze join the
+    block next to them). A portal is a cell with an open side into another block. For every block,
+    the distances between its portals through the block are precomputed. A query first searches the
+    abstract graph of portals, with the start and goal linked to the portals of their own blocks,
+    then fills in each step between two portals of one block with a search inside that block.
+
+    Every portal crossing is kept, so the abstract distance is the true shortest distance and the
+    refined path is as short as a breadth first search's.
+
+    Walls can change after the index is built: call wallChanged with the two cells and only the
+    blocks on either side are rebuilt.
+    """
+
+    def __init__(self, maze: Maze, blockSize: int = 16):
+        """
+        Builds the index. Each block costs one search inside the block per portal.
+
+        @param maze: the maze we are working on.
+        @param blockSize: side of a block in cells.
+        """
+        self.m_maze = maze
+        self.blockSize = blockSize
+        # nodes taken off the queue over every query, abstract and local
+        self.expanded = 0
+
+        # open neighbours of every cell, by (row, col)
+        self.m_open: Dict[tuple, List[tuple]] = {
+            (cell.getRow(), cell.getCol()): [(other.getRow(), other.getCol()) for other in others]
+            for cell, others in maze.openNeighbours().items()}
+
+        self.m_blockCells: Dict[tuple, List[tuple]] = {}
+        for loc in self.m_open:
+            self.m_blockCells.setdefault(self.blockOf(loc), []).append(loc)
+
+        # portals of each block, and portal -> [(portal, distance)] through its block
+        self.m_portals: Dict[tuple, List[tuple]] = {}
+        self.m_intra: Dict[tuple, List[tuple]] = {}
+        for block in self.m_blockCells:
+            self.buildBlock(block)
+        self.expanded = 0
+
+    def blockOf(self, loc: tuple) -> tuple:
+        """
+        @return The block that the cell at loc belongs to.
+        """
+        row = min(max(loc[0], 0), self.m_maze.rowNum() - 1)
+        col = min(max(loc[1], 0), self.m_maze.colNum() - 1)
+        return row // self.blockSize, col // self.blockSize
+
+    def buildBlock(self, block: tuple):
+        """
+        Finds the portals of block and the distances between them inside the block.
+        """
+        for portal in self.m_portals.get(block, []):
+            self.m_intra.pop(portal, None)
+
+        portals = [loc for loc in self.m_blockCells.get(block, [])
+                   if any(self.blockOf(other) != block for other in self.m_open.get(loc, []))]
+        self.m_portals[block] = portals
+        for portal in portals:
+            distances, _ = self.localSearch(portal, block)
+            self.m_intra[portal] = [(other, distances[other]) for other in portals
+                                    if other != portal and other in distances]
+
+    def wallChanged(self, cell1: Coordinates, cell2: Coordinates):
+        """
+        Brings the index up to date after the wall between cell1 and cell2 was added or removed.
+        Only the blocks of the two cells are rebuilt.
+        """
+        a, b = (cell1.getRow(), cell1.getCol()), (cell2.getRow(), cell2.getCol())
+        isOpen = not self.m_maze.hasWall(cell1, cell2)
+        for loc, other in ((a, b), (b, a)):
+            neighbours = self.m_open.setdefault(loc, [])
+            if isOpen and other not in neighbours:
+                neighbours.append(other)
+                cells = self.m_blockCells.setdefault(self.blockOf(loc), [])
+                if loc not in cells:
+                    cells.append(loc)
+            elif not isOpen and other in neighbours:
+                neighbours.remove(other)
+        for block in {self.blockOf(a), self.blockOf(b)}:
+            self.buildBlock(block)
+
+    def localSearch(self, start: tuple, block: tuple, goal: tuple = None):
+        """
+        Breadth first search from start that stays inside block, stopping at goal if one is given.
+
+        @return (distances, predecessors) for the cells reached.
+        """
+        distances = {start: 0}
+        predecessors: Dict[tuple, Optional[tuple]] = {start: None}
+        queue = deque([start])
+        while queue:
+            curr = queue.popleft()
+            self.expanded += 1
+            if curr == goal:
+                break
+            for other in self.m_open.get(curr, []):
+                if other not in distances and self.blockOf(other) == block:
+                    distances[other] = distances[curr] + 1
+                    predecessors[other] = curr
+                    queue.append(other)
+        return distances, predecessors
+
+    def shortestPath(self, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Searches the abstract graph from start to goal, then refines the result into cells.
+
+        @return The path from start to goal, or [] if goal can't be reached.
+        """
+        s, g = (start.getRow(), start.getCol()), (goal.getRow(), goal.getCol())
+        if s == g:
+            return [start]
+        if s not in self.m_open or g not in self.m_open:
+            return []
+        startBlock, goalBlock = self.blockOf(s), self.blockOf(g)
+
+        # link the start and goal to the portals of their blocks, and to each other if they share one
+        startDistances, _ = self.localSearch(s, startBlock)
+        goalDistances, _ = self.localSearch(g, goalBlock)
+        fromStart = [(portal, startDistances[portal]) for portal in self.m_portals.get(startBlock, [])
+                     if portal in startDistances]
+        if g in startDistances:
+            fromStart.append((g, startDistances[g]))
+        toGoal = {portal: goalDistances[portal] for portal in self.m_portals.get(goalBlock, [])
+                  if portal in goalDistances}
+
+        def heuristic(loc: tuple) -> int:
+            return abs(loc[0] - g[0]) + abs(loc[1] - g[1])
+
+        # A* over portals: a step is either through a block or across into the next one
+        dist = {s: 0}
+        parent: Dict[tuple, Optional[tuple]] = {s: None}
+        closed = set()
+        order = 0
+        queue = [(heuristic(s), order, s)]
+        while queue:
+            _, _, curr = heapq.heappop(queue)
+            if curr in closed:
+                continue
+            closed.add(curr)
+            self.expanded += 1
+            if curr == g:
+                break
+
+            steps = list(fromStart) if curr == s else list(self.m_intra.get(curr, []))
+            steps += [(other, 1) for other in self.m_open.get(curr, [])
+                      if self.blockOf(other) != self.blockOf(curr)]
+            if curr in toGoal:
+                steps.append((g, toGoal[curr]))
+
+            for other, length in steps:
+                candidate = dist[curr] + length
+                if other not in closed and candidate < dist.get(other, float('inf')):
+                    dist[other] = candidate
+                    parent[other] = curr
+                    order += 1
+                    heapq.heappush(queue, (candidate + heuristic(other), order, other))
+
+        if g not in closed:
+            return []
+
+        # refine: consecutive abstract nodes are either neighbours across a block edge, or in one block
+        waypoints = []
+        curr = g
+        while curr is not None:
+            waypoints.append(curr)
+            curr = parent[curr]
+        waypoints.reverse()
+
+        path = [s]
+        for a, b in zip(waypoints, waypoints[1:]):
+            if self.blockOf(a) != self.blockOf(b):
+                path.append(b)
+                continue
+            _, predecessors = self.localSearch(a, self.blockOf(a), b)
+            piece = []
+            curr = b
+            while curr is not None:
+                piece.append(curr)
+                curr = predecessors[curr]
+            piece.reverse()
+            path.extend(piece[1:])
+
+        cells = self.m_maze.m_cells
+        return [cells[loc] if loc in cells else Coordinates(loc[0], loc[1]) for loc in path]
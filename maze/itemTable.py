@@ -0,0 +1,71 @@
+# -------------------------------------------------
+# Column-oriented store for the items in a maze.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------
+
+from typing import List
+
+# numpy is optional; plain lists are used for the columns without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ItemTable:
+    """
+    The items of a maze as four parallel columns (rows, cols, weights, values), sorted once by row and
+    then column, plus a location -> index dictionary. With numpy installed the columns are int64
+    arrays that can be handed straight to vectorised code; otherwise they are lists.
+    """
+
+    def __init__(self, items: dict):
+        """
+        Constructor.
+
+        @param items: {(row, col): [weight, value]}, as stored in Maze.m_items
+        """
+        locations = sorted(items)
+        columns = ([loc[0] for loc in locations], [loc[1] for loc in locations],
+                   [items[loc][0] for loc in locations], [items[loc][1] for loc in locations])
+        if np is not None:
+            columns = tuple(np.array(column, dtype=np.int64) for column in columns)
+
+        self.rows, self.cols, self.weights, self.values = columns
+        self.m_locations = locations
+        self.m_index = {loc: i for i, loc in enumerate(locations)}
+        # built on the first call to asList
+        self.m_list = None
+
+    def __len__(self) -> int:
+        return len(self.m_locations)
+
+    def locations(self) -> List[tuple]:
+        """
+        @return (row, col) of every item, in table order.
+        """
+        return self.m_locations
+
+    def indexOf(self, loc: tuple) -> int:
+        """
+        @return Index of the item at loc, or -1 if there is none.
+        """
+        return self.m_index.get(loc, -1)
+
+    def totalWeight(self) -> int:
+        return int(np.sum(self.weights)) if np is not None else sum(self.weights)
+
+    def totalValue(self) -> int:
+        return int(np.sum(self.values)) if np is not None else sum(self.values)
+
+    def asList(self) -> list:
+        """
+        @return The items as [(row, col), weight, value] lists, in table order, as the knapsack solvers take them.
+                The list is built once and shared, so don't change it.
+        """
+        if self.m_list is None:
+            weights = self.weights.tolist() if np is not None else self.weights
+            values = self.values.tolist() if np is not None else self.values
+            self.m_list = [[loc, weight, value] for loc, weight, value in zip(self.m_locations, weights, values)]
+        return self.m_list
@@ -0,0 +1,180 @@
+# -------------------------------------------------------------------
+# The maze with every corridor contracted into one weighted edge, for
+# shortest path queries on a much smaller graph.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+import heapq
+
+from typing import List
+
+
+class JunctionGraph:
+    """
+    Most cells of a generated maze have exactly two open sides and only lead from one cell to the next.
+    Here such corridors are contracted: the nodes are junctions, dead ends and any cells asked to be
+    kept (items, entrances, exits), and each corridor between two nodes becomes one edge weighted by
+    its number of steps. Every corridor cell remembers its edge and how far along it lies, so a
+    query may start or end anywhere, and paths are expanded back into cells with the same length a
+    breadth first search would give.
+    """
+
+    def __init__(self, maze: Maze, keep: List[Coordinates] = None):
+        """
+        Builds the graph from the maze's open edges. O(V + E).
+
+        @param maze: the maze we are working on.
+        @param keep: cells that must be nodes even in the middle of a corridor.
+        """
+        # open edges, with cells numbered in the order they are first seen
+        neighbours = maze.openNeighbours()
+        self.m_cells: List[Coordinates] = list(neighbours)
+        self.m_index = {cell: i for i, cell in enumerate(self.m_cells)}
+        adjacency = [[self.m_index[other] for other in neighbours[cell]] for cell in self.m_cells]
+
+        n = len(self.m_cells)
+        self.isNode = [len(adjacency[i]) != 2 for i in range(n)]
+        for cell in keep or []:
+            if cell in self.m_index:
+                self.isNode[self.m_index[cell]] = True
+
+        # edges[e] = cells from one node to the other, both ends included
+        self.edges: List[List[int]] = []
+        # nodeEdges[node] = [(other node, edge, length)]
+        self.nodeEdges = {}
+        # corridor cell -> (edge, steps from the edge's first cell)
+        self.m_onEdge = {}
+        # nodes taken off the queue over every query
+        self.expanded = 0
+
+        for start in range(n):
+            if self.isNode[start]:
+                self.walkCorridors(start, adjacency)
+        # a loop of corridor cells with no node on it: make one of its cells a node
+        for start in range(n):
+            if not self.isNode[start] and start not in self.m_onEdge:
+                self.isNode[start] = True
+                self.walkCorridors(start, adjacency)
+
+    def walkCorridors(self, start: int, adjacency: list):
+        """
+        Follows every corridor leaving the node start that has not been walked yet, and adds it as an edge.
+        """
+        self.nodeEdges.setdefault(start, [])
+        for first in adjacency[start]:
+            if not self.isNode[first] and first in self.m_onEdge:
+                continue
+            if self.isNode[first] and any(other == first and len(self.edges[e]) == 2
+                                          for other, e, _ in self.nodeEdges[start]):
+                continue
+            cells = [start, first]
+            previous, curr = start, first
+            while not self.isNode[curr]:
+                nxt = adjacency[curr][0] if adjacency[curr][0] != previous else adjacency[curr][1]
+                previous, curr = curr, nxt
+                cells.append(curr)
+
+            edge = len(self.edges)
+            self.edges.append(cells)
+            for offset in range(1, len(cells) - 1):
+                self.m_onEdge[cells[offset]] = (edge, offset)
+            self.nodeEdges.setdefault(curr, [])
+            self.nodeEdges[start].append((curr, edge, len(cells) - 1))
+            if curr != start:
+                self.nodeEdges[curr].append((start, edge, len(cells) - 1))
+
+    def nodeCount(self) -> int:
+        return len(self.nodeEdges)
+
+    def attach(self, cell: int) -> list:
+        """
+        @return [(node, steps, cells walked from cell to the node, cell included)] for the nodes a
+                query at cell can leave by: cell itself if it is a node, else the two ends of its corridor.
+        """
+        if self.isNode[cell]:
+            return [(cell, 0, [cell])]
+        edge, offset = self.m_onEdge[cell]
+        cells = self.edges[edge]
+        return [(cells[0], offset, cells[offset::-1]), (cells[-1], len(cells) - 1 - offset, cells[offset:])]
+
+    def shortestPath(self, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Dijkstra over the junctions from the ends of start's corridor to the ends of goal's corridor.
+
+        @return The path from start to goal as cells, or [] if goal can't be reached.
+        """
+        if start == goal:
+            return [start]
+        if start not in self.m_index or goal not in self.m_index:
+            return []
+        s, g = self.m_index[start], self.m_index[goal]
+
+        best, bestPath = float('inf'), None
+        # start and goal in the same corridor: walking straight along it is one candidate
+        if not self.isNode[s] and not self.isNode[g] and self.m_onEdge[s][0] == self.m_onEdge[g][0]:
+            edge = self.edges[self.m_onEdge[s][0]]
+            a, b = self.m_onEdge[s][1], self.m_onEdge[g][1]
+            best = abs(a - b)
+            bestPath = edge[a:b + 1] if a <= b else edge[b:a + 1][::-1]
+
+        # both ends of a corridor can be the same node when it loops back, so keep the nearer one
+        targets = {}
+        for node, steps, cells in self.attach(g):
+            if node not in targets or steps < targets[node][0]:
+                targets[node] = (steps, cells[::-1])
+        dist = {}
+        parent = {}
+        queue = []
+        order = 0
+        for node, steps, cells in self.attach(s):
+            if steps < dist.get(node, float('inf')):
+                dist[node] = steps
+                parent[node] = (None, cells)
+                heapq.heappush(queue, (steps, order, node))
+                order += 1
+
+        done = set()
+        reached = None
+        while queue:
+            d, _, node = heapq.heappop(queue)
+            if node in done:
+                continue
+            if d >= best:
+                break
+            done.add(node)
+            self.expanded += 1
+            if node in targets and d + targets[node][0] < best:
+                best = d + targets[node][0]
+                reached = node
+            for other, edge, length in self.nodeEdges[node]:
+                candidate = d + length
+                if candidate < dist.get(other, float('inf')):
+                    dist[other] = candidate
+                    parent[other] = (node, edge)
+                    heapq.heappush(queue, (candidate, order, other))
+                    order += 1
+
+        if reached is None:
+            return [self.m_cells[i] for i in bestPath] if bestPath is not None else []
+
+        # expand back into cells: the goal end, then the edges back to start's end
+        pieces = [targets[reached][1]]
+        node = reached
+        while True:
+            previous, via = parent[node]
+            if previous is None:
+                pieces.append(via)
+                break
+            cells = self.edges[via]
+            pieces.append(cells if cells[-1] == node and cells[0] == previous else cells[::-1])
+            node = previous
+
+        path = []
+        for piece in reversed(pieces):
+            path.extend(piece if not path else piece[1:])
+        return [self.m_cells[i] for i in path]
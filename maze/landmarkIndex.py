@@ -0,0 +1,155 @@
+# -------------------------------------------------------------------
+# Landmark distances for a maze, giving lower bounds on the distance
+# between any two cells (the "ALT" technique: A*, landmarks and the
+# triangle inequality).
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+from collections import deque
+import hashlib
+import json
+import os
+
+from typing import List
+
+
+class LandmarkIndex:
+    """
+    Breadth first search distances from a few landmark cells to every cell. For any landmark L the
+    triangle inequality gives
+        |d(L, a) - d(L, b)| <= d(a, b) <= d(L, a) + d(L, b)
+    so lowerBound and upperBound cost one pass over the landmarks. The landmarks are the entrances
+    and exits, then cells chosen by farthest point sampling (each new landmark is the cell farthest
+    from all chosen so far), which spreads them around the edges of the maze where the bounds are
+    tightest.
+
+    The index depends only on the maze's open edges. With a directory it is saved there as
+    <fingerprint>.json and loaded again by any later run or solver on the same maze.
+    """
+
+    def __init__(self, maze: Maze, numLandmarks: int = 8, directory: str = None):
+        """
+        Builds the index, or loads it from directory when it was built for this maze before.
+
+        @param maze: the maze we are working on.
+        @param numLandmarks: landmarks to choose, including the entrances and exits.
+        @param directory: folder the index is saved to and loaded from; None keeps it in memory only.
+        """
+        self.numLandmarks = numLandmarks
+        self.loadedFromDisk = False
+
+        # open edges as pairs of (row, col), which is also what the fingerprint is made from
+        neighbours = {(cell.getRow(), cell.getCol()): [(other.getRow(), other.getCol()) for other in others]
+                      for cell, others in maze.openNeighbours().items()}
+        edges = sorted((a, b) for a in neighbours for b in neighbours[a] if a < b)
+        canonical = json.dumps([maze.rowNum(), maze.colNum(), numLandmarks, edges])
+        self.fingerprint = hashlib.sha256(canonical.encode()).hexdigest()
+
+        path = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, self.fingerprint + ".json")
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    stored = json.load(f)
+                self.m_locations = [tuple(loc) for loc in stored["cells"]]
+                self.m_index = {loc: i for i, loc in enumerate(self.m_locations)}
+                self.landmarks = [tuple(loc) for loc in stored["landmarks"]]
+                self.m_distances = stored["distances"]
+                self.loadedFromDisk = True
+                return
+
+        # cells are numbered in the order the sorted edges first mention them
+        self.m_locations = list(dict.fromkeys(loc for edge in edges for loc in edge))
+        self.m_index = {loc: i for i, loc in enumerate(self.m_locations)}
+        self.m_adjacency = [[self.m_index[other] for other in neighbours[loc]] for loc in self.m_locations]
+
+        self.landmarks = []
+        self.m_distances = []
+        for cell in maze.getEntrances() + maze.getExits():
+            loc = (cell.getRow(), cell.getCol())
+            if loc in self.m_index and loc not in self.landmarks and len(self.landmarks) < numLandmarks:
+                self.addLandmark(loc)
+
+        # farthest point sampling for the rest
+        nearest = [min(column) for column in zip(*self.m_distances)] if self.m_distances else None
+        while len(self.landmarks) < min(numLandmarks, len(self.m_locations)):
+            if nearest is None:
+                farthest = 0
+            else:
+                farthest = max(range(len(nearest)), key=lambda i: nearest[i])
+                if nearest[farthest] <= 0:
+                    break
+            self.addLandmark(self.m_locations[farthest])
+            latest = self.m_distances[-1]
+            nearest = latest[:] if nearest is None else [min(x, y) for x, y in zip(nearest, latest)]
+
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump({"cells": self.m_locations, "landmarks": self.landmarks,
+                           "distances": self.m_distances}, f)
+
+    def addLandmark(self, loc: tuple):
+        """
+        Adds loc as a landmark and runs a breadth first search from it over the open edges.
+        Cells that can't be reached get a distance of -1.
+        """
+        distances = [-1] * len(self.m_locations)
+        source = self.m_index[loc]
+        distances[source] = 0
+        queue = deque([source])
+        while queue:
+            curr = queue.popleft()
+            for neighbor in self.m_adjacency[curr]:
+                if distances[neighbor] == -1:
+                    distances[neighbor] = distances[curr] + 1
+                    queue.append(neighbor)
+        self.landmarks.append(loc)
+        self.m_distances.append(distances)
+
+    def contains(self, cell: Coordinates) -> bool:
+        """
+        @return True if cell is in the index.
+        """
+        return (cell.getRow(), cell.getCol()) in self.m_index
+
+    def landmarkDistances(self, cell: Coordinates) -> List[int]:
+        """
+        @return The distance from each landmark to cell, -1 where it can't be reached.
+        """
+        i = self.m_index[(cell.getRow(), cell.getCol())]
+        return [distances[i] for distances in self.m_distances]
+
+    def lowerBound(self, a: Coordinates, b: Coordinates) -> int:
+        """
+        @return A lower bound on the distance between a and b, 0 if either is not in the index.
+        """
+        i = self.m_index.get((a.getRow(), a.getCol()))
+        j = self.m_index.get((b.getRow(), b.getCol()))
+        if i is None or j is None:
+            return 0
+        bound = 0
+        for distances in self.m_distances:
+            if distances[i] >= 0 and distances[j] >= 0:
+                bound = max(bound, abs(distances[i] - distances[j]))
+        return bound
+
+    def upperBound(self, a: Coordinates, b: Coordinates) -> float:
+        """
+        @return An upper bound on the distance between a and b: the shortest detour through a
+                landmark, or inf if no landmark reaches both.
+        """
+        i = self.m_index.get((a.getRow(), a.getCol()))
+        j = self.m_index.get((b.getRow(), b.getCol()))
+        bound = float('inf')
+        if i is None or j is None:
+            return bound
+        for distances in self.m_distances:
+            if distances[i] >= 0 and distances[j] >= 0:
+                bound = min(bound, distances[i] + distances[j])
+        return bound
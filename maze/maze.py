@@ -6,12 +6,13 @@
 # __copyright__ = 'Copyright 2025, RMIT University'
 # -------------------------------------------------
 
-from typing import List
+from typing import List, Dict
 import random
 
 
 from maze.util import Coordinates
 from maze.edgeListGraph import EdgeListGraph
+from maze.itemTable import ItemTable
 
 
 class Maze:
@@ -42,6 +43,8 @@ class Maze:
         # store items as {cell: [weight, value]}
         self.m_itemParams = itemParams
         self.m_items = {}
+        # columnar copy of m_items, built on first use
+        self.m_itemTable = None
         self.initItems()
 
 
@@ -121,6 +124,23 @@ class Maze:
 
             self.m_items[loc] = [weight, value]
 
+        self.m_itemTable = None
+
+    def itemTable(self) -> ItemTable:
+        """
+        Returns the items as an ItemTable (columns sorted by row, then column). It is built once and
+        reused; call updateItemTable() after changing m_items directly.
+        """
+        if self.m_itemTable is None:
+            self.m_itemTable = ItemTable(self.m_items)
+        return self.m_itemTable
+
+    def updateItemTable(self):
+        """
+        Rebuilds the item table from m_items.
+        """
+        self.m_itemTable = ItemTable(self.m_items)
+
 
 
 
@@ -222,6 +242,20 @@ class Maze:
         """
         return self.m_graph.neighbours(cell)
 
+    def openNeighbours(self)->Dict[Coordinates, List[Coordinates]]:
+        """
+        Returns the cells each cell is joined to without a wall, built from the edge list. Cells are
+        keyed in the order the edges first mention them and their neighbours listed in edge order,
+        so anything numbering cells from it does so the same way every time.
+        """
+        neighbours = {}
+        for v1, v2, wall in self.getEdges():
+            if wall:
+                continue
+            neighbours.setdefault(v1, []).append(v2)
+            neighbours.setdefault(v2, []).append(v1)
+        return neighbours
+
     def edgeWeight(self, cell1:Coordinates, cell2:Coordinates)->int:
         """
         Returns the weight of the edge between two cells in the maze, 
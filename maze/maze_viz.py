@@ -125,8 +125,8 @@ class Visualizer(object):
         max_weight = self.m_maze.m_itemParams[1]
         max_value = self.m_maze.m_itemParams[2]
         cells_visited = len(set(path))
-        total_weight = sum(item[0] for item in self.m_maze.m_items.values())
-        total_value = sum(item[1] for item in self.m_maze.m_items.values())
+        total_weight = self.m_maze.itemTable().totalWeight()
+        total_value = self.m_maze.itemTable().totalValue()
         reward = self.m_solver.m_solver.m_reward
 
         # Format the list into lines of 3 items
@@ -0,0 +1,139 @@
+# -------------------------------------------------------------------
+# Distances and paths in a perfect (loop free) maze, answered from
+# the tree the maze's open edges form.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+from typing import List
+
+
+class TreeDistanceOracle:
+    """
+    With no walls removed at random, the generator carves a spanning tree, so the path between two
+    cells is unique and is the shortest one. The tree is rooted once and an Euler tour with a sparse
+    table of minimum depths gives the lowest common ancestor of any two cells in O(1). Then
+        dist(a, b) = depth(a) + depth(b) - 2 * depth(lca(a, b))
+    and path(a, b) climbs from both ends to the lca, in time proportional to the path length.
+
+    Whether the maze really is a tree is checked while building; when it is not, isTree is False and
+    the solvers go back to searching.
+    """
+
+    def __init__(self, maze: Maze):
+        """
+        Builds the oracle from the maze's open edges. O(E + V log V).
+
+        @param maze: the maze we are working on.
+        """
+        # cells are numbered in the order they are first seen
+        neighbours = maze.openNeighbours()
+        self.m_cells: List[Coordinates] = list(neighbours)
+        self.m_index = {cell: i for i, cell in enumerate(self.m_cells)}
+        adjacency = [[self.m_index[other] for other in neighbours[cell]] for cell in self.m_cells]
+        openEdges = sum(len(others) for others in adjacency) // 2
+
+        n = len(self.m_cells)
+        self.m_parent = [-1] * n
+        self.m_depth = [-1] * n
+        self.m_first = [-1] * n
+        self.m_euler = []
+        self.isTree = False
+        if n == 0:
+            return
+
+        # root the tree and walk its Euler tour, without recursion so large mazes are fine
+        self.m_depth[0] = 0
+        self.m_first[0] = 0
+        self.m_euler.append(0)
+        stack = [(0, 0)]
+        reached = 1
+        while stack:
+            node, nextChild = stack[-1]
+            if nextChild < len(adjacency[node]):
+                stack[-1] = (node, nextChild + 1)
+                child = adjacency[node][nextChild]
+                if self.m_depth[child] != -1:
+                    continue
+                self.m_parent[child] = node
+                self.m_depth[child] = self.m_depth[node] + 1
+                self.m_first[child] = len(self.m_euler)
+                self.m_euler.append(child)
+                stack.append((child, 0))
+                reached += 1
+            else:
+                stack.pop()
+                if stack:
+                    self.m_euler.append(stack[-1][0])
+
+        # a connected graph is a tree exactly when it has one edge fewer than it has vertices
+        self.isTree = reached == n and openEdges == n - 1
+        if not self.isTree:
+            return
+
+        # sparse[k][i] is the position of the shallowest cell in euler[i .. i + 2^k - 1]
+        eulerDepth = [self.m_depth[node] for node in self.m_euler]
+        self.m_eulerDepth = eulerDepth
+        self.m_sparse = [list(range(len(self.m_euler)))]
+        span = 1
+        while 2 * span <= len(self.m_euler):
+            previous = self.m_sparse[-1]
+            level = []
+            for i in range(len(self.m_euler) - 2 * span + 1):
+                left, right = previous[i], previous[i + span]
+                level.append(left if eulerDepth[left] <= eulerDepth[right] else right)
+            self.m_sparse.append(level)
+            span *= 2
+
+    def contains(self, cell: Coordinates) -> bool:
+        """
+        @return True if cell can be reached through the maze.
+        """
+        return cell in self.m_index
+
+    def lca(self, a: int, b: int) -> int:
+        """
+        @return The lowest common ancestor of the cells numbered a and b.
+        """
+        left, right = self.m_first[a], self.m_first[b]
+        if left > right:
+            left, right = right, left
+        k = (right - left + 1).bit_length() - 1
+        x, y = self.m_sparse[k][left], self.m_sparse[k][right - (1 << k) + 1]
+        return self.m_euler[x if self.m_eulerDepth[x] <= self.m_eulerDepth[y] else y]
+
+    def dist(self, a: Coordinates, b: Coordinates) -> int:
+        """
+        @return The number of steps between cells a and b, or -1 if either can't be reached.
+        """
+        if a not in self.m_index or b not in self.m_index:
+            return -1
+        i, j = self.m_index[a], self.m_index[b]
+        return self.m_depth[i] + self.m_depth[j] - 2 * self.m_depth[self.lca(i, j)]
+
+    def path(self, a: Coordinates, b: Coordinates) -> List[Coordinates]:
+        """
+        @return The path from a to b, or [] if either can't be reached.
+        """
+        if a not in self.m_index or b not in self.m_index:
+            return []
+        i, j = self.m_index[a], self.m_index[b]
+        top = self.lca(i, j)
+
+        up = []
+        while i != top:
+            up.append(self.m_cells[i])
+            i = self.m_parent[i]
+        up.append(self.m_cells[top])
+
+        down = []
+        while j != top:
+            down.append(self.m_cells[j])
+            j = self.m_parent[j]
+        down.reverse()
+
+        return up + down
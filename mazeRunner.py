@@ -18,6 +18,7 @@ from maze.util import Coordinates
 from maze.maze import Maze
 
 from knapsack.knapsack import Knapsack
+from knapsack.knapsackCache import KnapsackCache
 
 from reader.mazeReader import MazeReader
 from generator.mazeGenerator import MazeGenerator
@@ -51,7 +52,29 @@ def findItemsAndCalculatePath(knapsack: Knapsack, solver: MazeSolver, maze: Maze
 	pick up the items, and leave the maze.
 	"""
     knapsack.solveKnapsack(maze, csvFilename)
+    if knapsack.cache is not None:
+        print(f'Knapsack cache: {knapsack.cache.hits} hits ({knapsack.cache.diskHits} from disk), '
+              f'{knapsack.cache.misses} misses')
+    if knapsack.preprocessor is not None:
+        print(f'Knapsack preprocessing {knapsack.preprocessor.report()}')
+    if knapsack.plannedSolver is not None:
+        print(f'Knapsack planner chose {knapsack.plannedSolver} ({knapsack.planReason})')
+    if knapsack.frontierSizes:
+        print(f'Pareto frontier size per item: {knapsack.frontierSizes} (peak {max(knapsack.frontierSizes)})')
     solver.solveMaze(maze, entrance, exit)
+    for roundNum, length, gap, elapsed in getattr(solver.m_solver, 'm_routeRounds', []):
+        print(f'Route round {roundNum}: length {length}, gap {gap:.1%} ({elapsed:0.4f} seconds)')
+    if getattr(solver.m_solver, 'm_routeCost', None) is not None:
+        print(f'Weighted route cost: {solver.m_solver.m_routeCost}')
+    pathSearch = getattr(solver.m_solver, 'm_pathSearch', None)
+    if pathSearch is not None:
+        if pathSearch.m_oracle is not None:
+            print('Perfect maze: paths answered by the tree distance oracle')
+        else:
+            print(f'Path search ({pathSearch.method}) expanded {pathSearch.expanded} cells')
+        if pathSearch.m_landmarkIndex is not None:
+            source = 'loaded' if pathSearch.m_landmarkIndex.loadedFromDisk else 'built'
+            print(f'Landmark index {source} with {len(pathSearch.m_landmarkIndex.landmarks)} landmarks')
 
 
 #
@@ -122,12 +145,68 @@ if __name__ == '__main__':
         # initialise knapsack config
         capacity = configDict['knapsackCapacity']
         knapsackSolver = configDict['knapsackSolver']
+        # Optional: allowed relative loss of value for the approx knapsack solver
+        knapsackEpsilon: float = 0.1
+        if 'knapsackEpsilon' in configDict.keys():
+            knapsackEpsilon = configDict['knapsackEpsilon']
+        # Optional: shrink the knapsack instance before solving it
+        knapsackPreprocess: bool = False
+        if 'knapsackPreprocess' in configDict.keys():
+            knapsackPreprocess = configDict['knapsackPreprocess']
+        # Optional: number of threads for the threaded knapsack solver (defaults to the number of CPUs)
+        knapsackThreads: int = None
+        if 'knapsackThreads' in configDict.keys():
+            knapsackThreads = configDict['knapsackThreads']
+        # Optional: export the knapsack DP table as "csv" or "npy" (default "none")
+        knapsackTableExport: str = "none"
+        if 'knapsackTableExport' in configDict.keys():
+            knapsackTableExport = configDict['knapsackTableExport']
+        # Optional: number of item sets the topk knapsack solver offers to the maze solver
+        knapsackTopK: int = 1
+        if 'knapsackTopK' in configDict.keys():
+            knapsackTopK = configDict['knapsackTopK']
+        # Optional: folder for a cache of knapsack results that persists between runs
+        knapsackCache: KnapsackCache = None
+        if 'knapsackCacheDir' in configDict.keys():
+            knapsackCache = KnapsackCache(directory=configDict['knapsackCacheDir'])
+
+        # Optional: settings for the path finders
+        solverOptions = {}
+        # seconds the route heuristic may spend improving its tour
+        if 'routeTimeBudget' in configDict.keys():
+            solverOptions['routeTimeBudget'] = configDict['routeTimeBudget']
+        # more items than this are ordered by the route heuristic instead of Held-Karp
+        if 'routeHeuristicThreshold' in configDict.keys():
+            solverOptions['heuristicThreshold'] = configDict['routeHeuristicThreshold']
+        # shortest path search between points: "bfs", "bidirectional", "astar", "junction" or "hierarchical"
+        if 'pathSearch' in configDict.keys():
+            solverOptions['pathSearch'] = configDict['pathSearch']
+        # answer paths in perfect mazes from the tree instead of searching (default true)
+        if 'treeOracle' in configDict.keys():
+            solverOptions['useTreeOracle'] = configDict['treeOracle']
+        # landmarks for the A* lower bounds (default 0, off) and the folder their distances are kept in
+        if 'landmarks' in configDict.keys():
+            solverOptions['landmarks'] = configDict['landmarks']
+        if 'landmarkDir' in configDict.keys():
+            solverOptions['landmarkDir'] = configDict['landmarkDir']
+        # side of the blocks used by the hierarchical path search (default 16)
+        if 'hierarchyBlockSize' in configDict.keys():
+            solverOptions['blockSize'] = configDict['hierarchyBlockSize']
+        # "steps" (default) routes TaskC by the fewest steps, "weighted" by the cell weights of the maze
+        if 'pathCost' in configDict.keys():
+            solverOptions['weightedPaths'] = configDict['pathCost'] == 'weighted'
+        # worker processes for TaskC's breadth first searches (default 1, no pool)
+        if 'searchProcesses' in configDict.keys():
+            solverOptions['processes'] = configDict['searchProcesses']
 
         # Initialise maze object
         maze: Maze = Maze(rowNum, colNum, itemParams)
 
         # initialise knapsack object
-        knapsack: Knapsack = Knapsack(capacity, knapsackSolver)
+        knapsack: Knapsack = Knapsack(capacity, knapsackSolver, epsilon=knapsackEpsilon,
+                                      preprocess=knapsackPreprocess, threads=knapsackThreads,
+                                      tableExport=knapsackTableExport, topK=knapsackTopK,
+                                      cache=knapsackCache)
 
         # add the entrances and exits
         for [r, c] in entrances:
@@ -164,7 +243,7 @@ if __name__ == '__main__':
         if isMazeGenerated:
             entrance = mazeEntrances[solverEntIndex]
             exit = mazeExits[solverEntIndex]
-            solver = MazeSolver(pathFinderApproach, knapsack)
+            solver = MazeSolver(pathFinderApproach, knapsack, solverOptions)
             findItemsAndCalculatePath(knapsack, solver, maze, entrance, exit, csvFilename)
         else:
             print("Maze has not been generated or read properly from the file, hence solver wasn't called.")
@@ -186,15 +265,15 @@ if __name__ == '__main__':
         # --------------------------------------------------------------------
         if hasattr(knapsack, 'optimalCells') and knapsack.optimalCells is not None:
             import csv
-            if knapsack.knapsackSolver == "recur":
-                output_filename = "Knapsack_recur_items.csv"
-            elif knapsack.knapsackSolver == "dynamic":
-                output_filename = "Knapsack_dynamic_items.csv"
+            output_filename = f"Knapsack_{knapsack.knapsackSolver}_items.csv"
             with open(output_filename, "w", newline="") as csvfile:
                 writer = csv.writer(csvfile)
                 writer.writerow(["Item"])
                 for item in knapsack.optimalCells:
                     writer.writerow([item])
                 writer.writerow([knapsack.optimalValue])
+                # approximate solvers also record how far from optimal the value can be
+                if knapsack.approxGapBound is not None:
+                    writer.writerow(["Gap bound", knapsack.approxGapBound])
             print(f"\nKnapsack items saved in {output_filename}")
 
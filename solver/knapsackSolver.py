@@ -12,13 +12,19 @@ from maze.util import Coordinates
 from maze.maze import Maze
 
 from knapsack.knapsack import Knapsack
+from solver.pathSearch import PathSearch
+from solver.parallelSearch import ParallelSearch
 from itertools import permutations
+import time
 
-from typing import List, Dict, Optional
+from typing import List
 
 
 class KnapsackSolver:
-    def __init__(self, knapsack: Knapsack):
+    def __init__(self, knapsack: Knapsack, heldKarpThreshold: int = 8, heuristicThreshold: int = 13,
+                 routeTimeBudget: float = 1.0, pathSearch: str = "bfs", useTreeOracle: bool = True,
+                 landmarks: int = 0, landmarkDir: str = None, blockSize: int = 16,
+                 weightedPaths: bool = False, processes: int = 1):
         self.m_solverPath: List[Coordinates] = []
         self.m_cellsExplored = 0
         self.m_entranceUsed = None
@@ -26,79 +32,194 @@ class KnapsackSolver:
         self.m_knapsack = knapsack
         self.m_value = self.m_knapsack.optimalValue
         self.m_reward = 0
+        # routes through more knapsack cells than this are ordered with Held-Karp instead of permutations
+        self.m_heldKarpThreshold = heldKarpThreshold
+        # ... and routes through more than this with the anytime heuristic, for at most routeTimeBudget seconds
+        self.m_heuristicThreshold = heuristicThreshold
+        self.m_routeTimeBudget = routeTimeBudget
+        # (round, tour length, gap to the lower bound, seconds elapsed) for the chosen route, when the
+        # heuristic ordered it
+        self.m_routeRounds = []
+        # shortest path search between the points of a route; "bfs" runs one multi-target search per
+        # point, the others a point-to-point search per pair. Perfect mazes skip searching (see PathSearch)
+        self.m_pathSearch = PathSearch(pathSearch, useTreeOracle, landmarks, landmarkDir, blockSize)
+        # route by the cheapest paths by cell weight (Maze.edgeWeight) rather than the fewest steps
+        self.m_weightedPaths = weightedPaths
+        # weight cost of the chosen route, when routing by weight
+        self.m_routeCost = None
+        # with more than one process, the breadth first searches of solveMaze run in a process pool
+        # (only with the bfs path search; the other methods run in this process)
+        self.m_processes = processes
+        self.m_parallelSearch = None
 
     def reward(self):
         return self.m_knapsack.optimalValue - self.m_cellsExplored
 
-    def bfs(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+    def solveMaze(self, maze: Maze, entrance: Coordinates, exit: Coordinates):
         """
-        Finds the shortest path between start and goal coordinate using breadth first search
+        Finds the shortest path that goes from entrance, through knapsack cells, and to the exit.
+        When the knapsack offers several candidate item sets (the topk solver), the route for each
+        is found and the set with the best reward (value - cells explored) is kept in the knapsack.
 
         @param maze: the maze we are working on.
-        @param start: the starting coordinate.
-        @param goal: the goal coordinate.
-
-        @return A list containing coordinates to go from the start to the goal.
+        @param entrance: the starting coordinate.
+        @param exit: the end coordinate.
         """
+        candidates = self.m_knapsack.candidates
+        if not candidates:
+            candidates = [(self.m_knapsack.optimalCells, self.m_knapsack.optimalWeight,
+                           self.m_knapsack.optimalValue)]
 
-        if start == goal:
-            return [start]
+        self.openParallelSearch(maze)
 
-        visited = set()
-        queue = [start]
-        predecessors: Dict[Coordinates, Optional[Coordinates]] = {start: None}
+        best_path = None
+        best_reward = float('-inf')
+        try:
+            for cells, weight, value in candidates:
+                self.m_lastRouteRounds = []
+                path = self.findRoute(maze, entrance, exit, cells)
+                reward = value - len(set(path))
+                if reward > best_reward:
+                    best_reward = reward
+                    best_path = path
+                    self.m_routeRounds = self.m_lastRouteRounds
+                    self.m_knapsack.optimalCells = cells
+                    self.m_knapsack.optimalWeight = weight
+                    self.m_knapsack.optimalValue = value
+        finally:
+            self.closeParallelSearch()
 
-        while queue:
-            curr = queue.pop(0)
-
-            if curr == goal:
-                # Reconstruct path from goal to start
-                path = []
-                while curr is not None:
-                    path.append(curr)
-                    curr = predecessors[curr]
-                return list(reversed(path))
-
-            visited.add(curr)
+        self.m_solverPath = best_path
+        self.m_entranceUsed = entrance
+        self.m_exitUsed = exit
+        self.m_cellsExplored = len(set(self.m_solverPath))
+        self.m_reward = self.reward()
+        if self.m_weightedPaths:
+            self.m_routeCost = self.m_pathSearch.pathCost(maze, self.m_solverPath)
 
-            for neighbor in maze.neighbours(curr):
-                if neighbor not in visited and neighbor not in predecessors:
-                    if not maze.hasWall(curr, neighbor):
-                        queue.append(neighbor)
-                        predecessors[neighbor] = curr
+    def openParallelSearch(self, maze: Maze):
+        """
+        Opens the process pool for the breadth first searches of pointPaths when there is more than
+        one process, the path search is bfs (the pool only runs breadth first searches) and the searches
+        can't be answered without searching. Close it with closeParallelSearch.
+        """
+        if (self.m_processes > 1 and self.m_pathSearch.method == "bfs" and not self.m_weightedPaths
+                and self.m_pathSearch.treeOracle(maze) is None):
+            self.m_parallelSearch = ParallelSearch(maze, self.m_processes)
 
-        # If goal is unreachable (shouldn’t happen in a fully connected maze)
-        return []
+    def closeParallelSearch(self):
+        """
+        Closes the process pool, if one is open, adding its expanded cells to the path search's.
+        """
+        if self.m_parallelSearch is not None:
+            self.m_pathSearch.expanded += self.m_parallelSearch.expanded
+            self.m_parallelSearch.close()
+            self.m_parallelSearch = None
 
-    def solveMaze(self, maze: Maze, entrance: Coordinates, exit: Coordinates):
+    def findRoute(self, maze: Maze, entrance: Coordinates, exit: Coordinates, cells: list) -> List[Coordinates]:
         """
-        Finds the shortest path that goes from entrance, through knapsack cells, and to the exit.
+        Finds the shortest path that goes from entrance, through the given cells, and to the exit.
 
         @param maze: the maze we are working on.
         @param entrance: the starting coordinate.
         @param exit: the end coordinate.
+        @param cells: (row, col) locations that must be visited.
+
+        @return A list containing coordinates to go from the entrance to the exit.
         """
 
         # get all points of interest:
-        points = [entrance] + list(self.m_knapsack.optimalCells) + [exit]
+        points = [entrance] + list(cells) + [exit]
         # make sure everything is a coordinate type
 
         for i in range(1, len(points) - 1):
             points[i] = Coordinates(points[i][0], points[i][1])
 
         # find minimum paths between all points
+        distances, paths = self.pointPaths(maze, points)
+
+        knapsack_cells = points[1:-1]
+
+        if len(knapsack_cells) <= self.m_heldKarpThreshold:
+            min_path = self.permutationRoute(entrance, exit, knapsack_cells, distances, paths)
+        elif len(knapsack_cells) <= self.m_heuristicThreshold:
+            min_path = self.heldKarpRoute(entrance, exit, knapsack_cells, distances, paths)
+        else:
+            min_path = self.heuristicRoute(entrance, exit, knapsack_cells, distances, paths)
+
+        return [entrance] + min_path
+
+    def pointPaths(self, maze: Maze, points: List[Coordinates]):
+        """
+        Finds the shortest path from every point but the last to every point but the first, with the
+        settings of this solver: by weight when weightedPaths is set, else from the tree in a perfect
+        maze, on the process pool when one is open, or with the chosen PathSearch method.
+
+        @param maze: the maze we are working on.
+        @param points: the entrance, the cells to visit and the exit, as Coordinates.
+
+        @return (distances, paths) dictionaries keyed by (point, point); unreachable points have a
+                distance of -1 and an empty path.
+        """
         distances = {}  # distances between each pair of points
         paths = {}  # To store the actual paths between points
 
-        for i in range(len(points)):
-            for j in range(len(points)):
-                if j != i:
-                    path = self.bfs(maze, points[i], points[j])
+        # a route never returns to the entrance or leaves the exit, so only the entrance and the
+        # knapsack cells need a search, and one search reaches every other point
+        if self.m_weightedPaths:
+            # by weight, distances are the costs of the cheapest paths
+            for i in range(len(points) - 1):
+                costs, predecessors = self.m_pathSearch.weightedSearch(maze, points[i], points[1:])
+                for j in range(1, len(points)):
+                    if j != i:
+                        reached = points[j] in predecessors
+                        distances[(points[i], points[j])] = costs[points[j]] if reached else -1
+                        paths[(points[i], points[j])] = self.m_pathSearch.tracePath(predecessors, points[j]) if reached else []
+        elif self.m_parallelSearch is not None:
+            # the same searches as below, one per worker process
+            results = self.m_parallelSearch.searchAll(points[:-1], points[1:])
+            for i in range(len(points) - 1):
+                searchDistances, searchPaths = results[points[i]]
+                for j in range(1, len(points)):
+                    if j != i:
+                        distances[(points[i], points[j])] = searchDistances[points[j]]
+                        paths[(points[i], points[j])] = searchPaths[points[j]]
+        else:
+            # in a perfect maze every path comes straight from the tree, so nothing is searched
+            oracle = self.m_pathSearch.treeOracle(maze)
+            for i in range(len(points) - 1):
+                if oracle is None and self.m_pathSearch.method == "bfs":
+                    _, predecessors = self.m_pathSearch.multiTargetBfs(maze, points[i], points[1:])
+                for j in range(1, len(points)):
+                    if j == i:
+                        continue
+                    if oracle is not None:
+                        path = oracle.path(points[i], points[j])
+                    elif self.m_pathSearch.method == "bfs":
+                        path = self.m_pathSearch.tracePath(predecessors, points[j]) if points[j] in predecessors else []
+                    elif 0 < j < i:
+                        # the maze is undirected, so the path back was found with the path there
+                        path = paths[(points[j], points[i])][::-1]
+                    else:
+                        path = self.m_pathSearch.shortestPath(maze, points[i], points[j])
                     distances[(points[i], points[j])] = len(path) - 1  # Store the distance (edge count)
                     paths[(points[i], points[j])] = path  # Store the actual path
 
-        knapsack_cells = points[1:-1]
+        return distances, paths
+
+    def permutationRoute(self, entrance: Coordinates, exit: Coordinates, knapsack_cells: List[Coordinates],
+                         distances: dict, paths: dict) -> List[Coordinates]:
+        """
+        Orders the knapsack cells by trying every permutation. O(n! * L).
 
+        @param entrance: the starting coordinate.
+        @param exit: the end coordinate.
+        @param knapsack_cells: the cells to visit.
+        @param distances: distances between each pair of points.
+        @param paths: the paths between each pair of points.
+
+        @return The route after the entrance, through the cells, to the exit.
+        """
         # Try all permutations of the knapsack cells to find the shortest route
         # where multiple solutions exist, choose the one that minimises unique cell visits
         min_path = None
@@ -126,8 +247,220 @@ class KnapsackSolver:
                     min_explored = explored
                     min_path = full_route
 
-        self.m_solverPath = [entrance] + min_path
-        self.m_entranceUsed = entrance
-        self.m_exitUsed = exit
-        self.m_cellsExplored = len(set(self.m_solverPath))
-        self.m_reward = self.reward()
+        return min_path
+
+    def heldKarpRoute(self, entrance: Coordinates, exit: Coordinates, knapsack_cells: List[Coordinates],
+                      distances: dict, paths: dict) -> List[Coordinates]:
+        """
+        Orders the knapsack cells with the Held-Karp DP over subsets. O(n^2 * 2^n).
+        best[mask][last] is the shortest walk from the entrance through exactly the cells in mask that
+        ends at cell last. As with the permutation search, ties in distance go to the walk that
+        explores fewer unique cells; each tie is settled as it is met, which is exact for the
+        distance but only a heuristic for the cell count.
+
+        @param entrance: the starting coordinate.
+        @param exit: the end coordinate.
+        @param knapsack_cells: the cells to visit.
+        @param distances: distances between each pair of points.
+        @param paths: the paths between each pair of points.
+
+        @return The route after the entrance, through the cells, to the exit.
+        """
+        n = len(knapsack_cells)
+        full = 1 << n
+        INF = float('inf')
+
+        # cells explored along each segment, built when first needed
+        segments = {}
+
+        def segment(a: Coordinates, b: Coordinates) -> set:
+            if (a, b) not in segments:
+                segments[(a, b)] = set(paths[(a, b)][1:])
+            return segments[(a, b)]
+
+        best = [[INF] * n for _ in range(full)]
+        parent = [[-1] * n for _ in range(full)]
+        for j in range(n):
+            best[1 << j][j] = distances[(entrance, knapsack_cells[j])]
+
+        # cells explored by the walk behind each state; only worked out for states involved in a tie
+        explored = {}
+
+        def walkCells(mask: int, last: int) -> set:
+            if (mask, last) not in explored:
+                previous = parent[mask][last]
+                if previous == -1:
+                    cells = segment(entrance, knapsack_cells[last])
+                else:
+                    cells = walkCells(mask ^ (1 << last), previous) | segment(knapsack_cells[previous],
+                                                                               knapsack_cells[last])
+                explored[(mask, last)] = cells
+            return explored[(mask, last)]
+
+        # masks only ever grow, so a state is final before anything extends it
+        for mask in range(1, full):
+            for last in range(n):
+                dist = best[mask][last]
+                if dist == INF:
+                    continue
+                for nxt in range(n):
+                    bit = 1 << nxt
+                    if mask & bit:
+                        continue
+                    candidate = dist + distances[(knapsack_cells[last], knapsack_cells[nxt])]
+                    if candidate < best[mask | bit][nxt]:
+                        best[mask | bit][nxt] = candidate
+                        parent[mask | bit][nxt] = last
+                        explored.pop((mask | bit, nxt), None)
+                    elif candidate == best[mask | bit][nxt]:
+                        via = walkCells(mask, last) | segment(knapsack_cells[last], knapsack_cells[nxt])
+                        if len(via) < len(walkCells(mask | bit, nxt)):
+                            parent[mask | bit][nxt] = last
+                            explored[(mask | bit, nxt)] = via
+
+        # close every walk at the exit
+        end, end_distance, end_explored = -1, INF, INF
+        for last in range(n):
+            total = best[full - 1][last] + distances[(knapsack_cells[last], exit)]
+            if total > end_distance:
+                continue
+            cells = len(walkCells(full - 1, last) | segment(knapsack_cells[last], exit))
+            if total < end_distance or cells < end_explored:
+                end, end_distance, end_explored = last, total, cells
+
+        order = []
+        mask = full - 1
+        while end != -1:
+            order.append(knapsack_cells[end])
+            mask, end = mask ^ (1 << end), parent[mask][end]
+        order.reverse()
+
+        full_path = [entrance] + order + [exit]
+        full_route = []
+        for i in range(len(full_path) - 1):
+            full_route.extend(paths[(full_path[i], full_path[i + 1])][1:])
+
+        return full_route
+
+    def heuristicRoute(self, entrance: Coordinates, exit: Coordinates, knapsack_cells: List[Coordinates],
+                       distances: dict, paths: dict) -> List[Coordinates]:
+        """
+        Anytime ordering for too many cells for Held-Karp. A nearest-neighbour tour is improved in
+        rounds of 2-opt (reverse a stretch of the tour) and Or-opt (move a run of 1 to 3 cells elsewhere,
+        either way round) until a round finds nothing or routeTimeBudget seconds have passed. The tour
+        length and its gap to a lower bound after each round are kept in m_lastRouteRounds.
+
+        @param entrance: the starting coordinate.
+        @param exit: the end coordinate.
+        @param knapsack_cells: the cells to visit.
+        @param distances: distances between each pair of points.
+        @param paths: the paths between each pair of points.
+
+        @return The route after the entrance, through the cells, to the exit.
+        """
+        startTime = time.perf_counter()
+        deadline = startTime + self.m_routeTimeBudget
+        n = len(knapsack_cells)
+
+        # 0 is the entrance, 1..n the cells and n + 1 the exit; only searches from the entrance and the
+        # cells were run, so the maze being undirected fills in the rest
+        points = [entrance] + list(knapsack_cells) + [exit]
+        dist = [[0] * (n + 2) for _ in range(n + 2)]
+        for i in range(n + 1):
+            for j in range(1, n + 2):
+                if i != j:
+                    dist[i][j] = dist[j][i] = distances[(points[i], points[j])]
+
+        # nearest neighbour from the entrance
+        tour = [0]
+        unvisited = set(range(1, n + 1))
+        while unvisited:
+            nearest = min(unvisited, key=lambda j: dist[tour[-1]][j])
+            tour.append(nearest)
+            unvisited.remove(nearest)
+        tour.append(n + 1)
+
+        length = sum(dist[a][b] for a, b in zip(tour, tour[1:]))
+        bound = self.routeLowerBound(dist)
+        self.m_lastRouteRounds = [(0, length, self.routeGap(length, bound), time.perf_counter() - startTime)]
+
+        improved = True
+        roundNum = 0
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            roundNum += 1
+
+            # 2-opt: reverse tour[i..j], keeping the entrance and exit in place
+            for i in range(1, n):
+                for j in range(i + 1, n + 1):
+                    a, b, c, d = tour[i - 1], tour[i], tour[j], tour[j + 1]
+                    gain = dist[a][b] + dist[c][d] - dist[a][c] - dist[b][d]
+                    if gain > 0:
+                        tour[i:j + 1] = reversed(tour[i:j + 1])
+                        length -= gain
+                        improved = True
+                if time.perf_counter() >= deadline:
+                    break
+
+            # Or-opt: move tour[i..i + size - 1] between two other stops, possibly reversed
+            for size in (1, 2, 3):
+                i = 1
+                while i + size <= n + 1 and time.perf_counter() < deadline:
+                    first, last = tour[i], tour[i + size - 1]
+                    before, after = tour[i - 1], tour[i + size]
+                    removed = dist[before][first] + dist[last][after] - dist[before][after]
+                    rest = tour[:i] + tour[i + size:]
+                    move = None
+                    for p in range(len(rest) - 1):
+                        if p == i - 1:
+                            continue
+                        a, b = rest[p], rest[p + 1]
+                        forward = removed - (dist[a][first] + dist[last][b] - dist[a][b])
+                        backward = removed - (dist[a][last] + dist[first][b] - dist[a][b])
+                        if forward > 0 and (move is None or forward > move[0]):
+                            move = (forward, p, False)
+                        if backward > 0 and (move is None or backward > move[0]):
+                            move = (backward, p, True)
+                    if move is not None:
+                        gain, p, flip = move
+                        run = tour[i:i + size]
+                        if flip:
+                            run.reverse()
+                        tour = rest[:p + 1] + run + rest[p + 1:]
+                        length -= gain
+                        improved = True
+                    i += 1
+
+            self.m_lastRouteRounds.append((roundNum, length, self.routeGap(length, bound),
+                                           time.perf_counter() - startTime))
+
+        full_route = []
+        for a, b in zip(tour, tour[1:]):
+            full_route.extend(paths[(points[a], points[b])][1:])
+
+        return full_route
+
+    def routeLowerBound(self, dist: list) -> int:
+        """
+        Lower bound on any route from point 0 through every point to the last one. Each cell on the
+        route is left by one step and entered by another, so it costs at least half its two shortest
+        distances; the entrance and exit only have one step each.
+
+        @param dist: distance matrix, 0 = entrance, last = exit.
+
+        @return The lower bound.
+        """
+        last = len(dist) - 1
+        if last == 1:
+            return dist[0][1]
+        total = min(dist[0][1:last]) + min(dist[last][1:last])
+        for i in range(1, last):
+            nearest = sorted(dist[i][j] for j in range(last + 1) if j != i)
+            total += nearest[0] + nearest[1]
+        return max(dist[0][last], (total + 1) // 2)
+
+    def routeGap(self, length: int, bound: int) -> float:
+        """
+        @return How far length is above the lower bound, as a fraction of the bound.
+        """
+        return (length - bound) / bound if bound > 0 else 0.0
@@ -14,19 +14,28 @@ from typing import List
 
 from solver.knapsackSolver import KnapsackSolver
 from solver.taskDSolver import TaskDSolver
+from solver.prizeCollectingSolver import PrizeCollectingSolver
 
+# the solverOptions that TaskD understands; the others are about ordering items along a route
+TASKD_OPTIONS = ('pathSearch', 'useTreeOracle', 'landmarks', 'landmarkDir', 'blockSize')
 
 
 class MazeSolver:
 
-    def __init__(self, solverName:str, knapsack:Knapsack = None):
-        
+    def __init__(self, solverName:str, knapsack:Knapsack = None, solverOptions:dict = None):
+        # solverOptions: optional keyword arguments for the solvers (TaskD only takes TASKD_OPTIONS)
+        if solverOptions is None:
+            solverOptions = {}
+
         # self.m_solved: true if the solver has found the exit (maze "solved")
         self.m_solved = False
         if solverName == 'TaskC':
-            self.m_solver = KnapsackSolver(knapsack)
+            self.m_solver = KnapsackSolver(knapsack, **solverOptions)
         elif solverName == 'TaskD':
-            self.m_solver = TaskDSolver(knapsack)
+            self.m_solver = TaskDSolver(knapsack, **{key: value for key, value in solverOptions.items()
+                                                     if key in TASKD_OPTIONS})
+        elif solverName == 'PrizeCollecting':
+            self.m_solver = PrizeCollectingSolver(knapsack, **solverOptions)
 
 
     def solveMaze(self, maze: Maze, entrance: Coordinates, exit: Coordinates = None):
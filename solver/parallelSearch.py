@@ -0,0 +1,175 @@
+# -------------------------------------------------------------------
+# Breadth first searches from many sources at once, fanned out to a
+# pool of worker processes that share the maze through shared memory.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from typing import List, Dict
+
+
+# bits of a cell's open sides, in the order Maze.neighbours lists them, so searches break ties the same way
+LEFT, RIGHT, UP, DOWN = 1, 2, 4, 8
+
+# the shared maze as seen by a worker process: (memory block, rows, cols)
+workerMaze = None
+
+
+def attachWorker(name: str, rows: int, cols: int):
+    """
+    Runs once in each worker: attaches to the shared maze instead of receiving a copy of it.
+    """
+    global workerMaze
+    workerMaze = (shared_memory.SharedMemory(name=name), rows, cols)
+
+
+def searchFromSource(source: int, targets: List[int]):
+    """
+    Breadth first search in a worker from the cell numbered source, stopping once every target is
+    reached. The paths to the targets are traced here, so only they travel back to the parent
+    process rather than the search tree of the whole maze.
+
+    @return (source, cells on the path to each target from source (empty if unreachable), cells
+             expanded), with each path as an int32 array.
+    """
+    memory, rows, cols = workerMaze
+    sides = memory.buf
+    width = cols + 2
+    steps = ((LEFT, -1), (RIGHT, 1), (UP, -width), (DOWN, width))
+
+    # parent of every cell reached, -1 for the source and -2 for cells not reached yet
+    parents = array('i', [-2]) * len(sides)
+    parents[source] = -1
+    remaining = set(targets)
+    remaining.discard(source)
+    queue = deque([source])
+    expanded = 0
+
+    while queue and remaining:
+        curr = queue.popleft()
+        expanded += 1
+        openSides = sides[curr]
+        for bit, delta in steps:
+            if openSides & bit:
+                neighbor = curr + delta
+                if parents[neighbor] == -2:
+                    parents[neighbor] = curr
+                    remaining.discard(neighbor)
+                    queue.append(neighbor)
+
+    paths = []
+    for target in targets:
+        path = array('i')
+        if parents[target] != -2:
+            curr = target
+            while curr != -1:
+                path.append(curr)
+                curr = parents[curr]
+            path.reverse()
+        paths.append(path)
+
+    return source, paths, expanded
+
+
+class ParallelSearch:
+    """
+    Runs one multi-target breadth first search per source on a pool of processes. The maze is
+    written once into shared memory as a byte per cell holding its open sides, which each worker
+    attaches to when it starts, so Maze and its graph are never pickled. Workers send back only the
+    paths to the targets, as int32 arrays of cell numbers.
+
+    Use it as a context manager so the pool and the shared memory are released:
+        with ParallelSearch(maze, processes) as search:
+            results = search.searchAll(sources, targets)
+    """
+
+    def __init__(self, maze: Maze, processes: int):
+        """
+        Writes the maze into shared memory and starts the pool.
+
+        @param maze: the maze we are working on.
+        @param processes: number of worker processes.
+        """
+        self.m_maze = maze
+        self.m_rows = maze.rowNum()
+        self.m_cols = maze.colNum()
+        # cells expanded over every search, in all workers
+        self.expanded = 0
+
+        # the grid plus its boundary ring, row by row; cell (r, c) is at (r + 1) * (cols + 2) + c + 1
+        self.m_memory = shared_memory.SharedMemory(create=True, size=(self.m_rows + 2) * (self.m_cols + 2))
+        sides = self.m_memory.buf
+        sides[:] = bytes(len(sides))
+        for cell, others in maze.openNeighbours().items():
+            a = self.cellIndex(cell)
+            for other in others:
+                b = self.cellIndex(other)
+                if b == a + 1:
+                    sides[a] |= RIGHT
+                elif b == a - 1:
+                    sides[a] |= LEFT
+                elif b > a:
+                    sides[a] |= DOWN
+                else:
+                    sides[a] |= UP
+
+        self.m_pool = ProcessPoolExecutor(max_workers=processes, initializer=attachWorker,
+                                          initargs=(self.m_memory.name, self.m_rows, self.m_cols))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Stops the pool and frees the shared memory.
+        """
+        self.m_pool.shutdown()
+        self.m_memory.close()
+        self.m_memory.unlink()
+
+    def cellIndex(self, cell: Coordinates) -> int:
+        return (cell.getRow() + 1) * (self.m_cols + 2) + cell.getCol() + 1
+
+    def cellAt(self, index: int) -> Coordinates:
+        row, col = divmod(index, self.m_cols + 2)
+        loc = (row - 1, col - 1)
+        return self.m_maze.m_cells.get(loc, Coordinates(loc[0], loc[1]))
+
+    def searchAll(self, sources: List[Coordinates], targets: List[Coordinates]) -> Dict[Coordinates, tuple]:
+        """
+        Searches from every source at once.
+
+        @param sources: the coordinates to search from.
+        @param targets: the coordinates to find paths to from every source.
+
+        @return {source: (distances, paths)} where distances[target] is the number of steps (-1 if it
+                can't be reached) and paths[target] the path from source to target ([] if it can't be
+                reached).
+        """
+        targetIndices = [self.cellIndex(target) for target in targets]
+        futures = [self.m_pool.submit(searchFromSource, self.cellIndex(source), targetIndices)
+                   for source in sources]
+
+        results = {}
+        for source, future in zip(sources, futures):
+            _, targetPaths, expanded = future.result()
+            self.expanded += expanded
+            distances = {}
+            paths = {}
+            for target, path in zip(targets, targetPaths):
+                distances[target] = len(path) - 1
+                paths[target] = [self.cellAt(index) for index in path]
+            results[source] = (distances, paths)
+        return results
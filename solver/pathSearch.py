@@ -0,0 +1,428 @@
+# -------------------------------------------------------------------
+# Point to point shortest path searches shared by the maze solvers.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+from maze.treeDistanceOracle import TreeDistanceOracle
+from maze.landmarkIndex import LandmarkIndex
+from maze.junctionGraph import JunctionGraph
+from maze.hierarchicalIndex import HierarchicalIndex
+
+from collections import deque
+import heapq
+
+from typing import List, Dict, Optional
+
+
+class PathSearch:
+    """
+    Finds a shortest path between two cells with one of:
+        bfs           - breadth first search from the start
+        bidirectional - breadth first search from both ends, meeting in the middle
+        astar         - A* with the Manhattan distance to the goal as the heuristic
+        junction      - Dijkstra on the JunctionGraph of the maze, where each corridor is one edge
+        hierarchical  - A* between the blocks of a HierarchicalIndex, refined inside each block
+    All of them return paths of the same length; which path is returned when several are shortest can
+    differ. expanded counts the cells taken off the queue over every search, so the methods can be
+    compared on the same maze.
+
+    In a perfect maze (no loops) the searches are skipped altogether: with useTreeOracle set, the first
+    query builds a TreeDistanceOracle and every query on that maze is answered from the tree, which
+    gives the same paths as any of the searches since each path is unique.
+
+    With landmarks above 0, A* also takes the landmark lower bound of a LandmarkIndex (built once per
+    maze, and kept in landmarkDir if given) when it beats the Manhattan distance.
+    """
+
+    def __init__(self, method: str = "bfs", useTreeOracle: bool = True, landmarks: int = 0,
+                 landmarkDir: str = None, blockSize: int = 16):
+        if method not in ("bfs", "bidirectional", "astar", "junction", "hierarchical"):
+            raise Exception("Incorrect Path Search Used.")
+        self.method = method
+        self.expanded = 0
+        self.useTreeOracle = useTreeOracle
+        # the oracle of the last maze seen, None if it is not a tree
+        self.m_oracleMaze = None
+        self.m_oracle = None
+        self.landmarks = landmarks
+        self.landmarkDir = landmarkDir
+        self.m_landmarkMaze = None
+        self.m_landmarkIndex = None
+        self.m_junctionMaze = None
+        self.m_junctionGraph = None
+        # side of the blocks of the hierarchical index
+        self.blockSize = blockSize
+        self.m_hierarchyMaze = None
+        self.m_hierarchy = None
+        # open neighbours of every cell of the last maze searched by steps
+        self.m_adjacencyMaze = None
+        self.m_adjacency = None
+        # open neighbours and step costs of the last maze searched by weight
+        self.m_weightedMaze = None
+        self.m_weightedAdjacency = None
+        self.m_maxStepCost = 0
+
+    def treeOracle(self, maze: Maze):
+        """
+        @return The TreeDistanceOracle for maze if it is a perfect maze and the oracle is in use,
+                otherwise None. It is built on the first call for each maze.
+        """
+        if not self.useTreeOracle:
+            return None
+        if self.m_oracleMaze is not maze:
+            oracle = TreeDistanceOracle(maze)
+            self.m_oracle = oracle if oracle.isTree else None
+            self.m_oracleMaze = maze
+        return self.m_oracle
+
+    def landmarkIndex(self, maze: Maze):
+        """
+        @return The LandmarkIndex for maze, or None if landmarks are not in use. It is built (or loaded
+                from landmarkDir) on the first call for each maze.
+        """
+        if self.landmarks <= 0:
+            return None
+        if self.m_landmarkMaze is not maze:
+            self.m_landmarkIndex = LandmarkIndex(maze, self.landmarks, self.landmarkDir)
+            self.m_landmarkMaze = maze
+        return self.m_landmarkIndex
+
+    def junctionGraph(self, maze: Maze) -> JunctionGraph:
+        """
+        @return The JunctionGraph for maze, with its entrances and exits kept as nodes. It is built on
+                the first call for each maze.
+        """
+        if self.m_junctionMaze is not maze:
+            self.m_junctionGraph = JunctionGraph(maze, maze.getEntrances() + maze.getExits())
+            self.m_junctionMaze = maze
+        return self.m_junctionGraph
+
+    def hierarchicalIndex(self, maze: Maze) -> HierarchicalIndex:
+        """
+        @return The HierarchicalIndex for maze. It is built on the first call for each maze, and kept
+                up to date by wallChanged.
+        """
+        if self.m_hierarchyMaze is not maze:
+            self.m_hierarchy = HierarchicalIndex(maze, self.blockSize)
+            self.m_hierarchyMaze = maze
+        return self.m_hierarchy
+
+    def wallChanged(self, maze: Maze, cell1: Coordinates, cell2: Coordinates):
+        """
+        Call after adding or removing the wall between cell1 and cell2. The hierarchical index only
+        rebuilds the blocks on either side; everything else built for maze (the tree oracle, the
+        landmark index, the junction graph and the adjacency lists) is dropped and built again when
+        next needed.
+
+        @param maze: the maze whose wall changed.
+        @param cell1: cell on one side of the wall.
+        @param cell2: cell on the other side.
+        """
+        if self.m_hierarchyMaze is maze:
+            self.m_hierarchy.wallChanged(cell1, cell2)
+        if self.m_oracleMaze is maze:
+            self.m_oracleMaze = None
+            self.m_oracle = None
+        if self.m_landmarkMaze is maze:
+            self.m_landmarkMaze = None
+            self.m_landmarkIndex = None
+        if self.m_junctionMaze is maze:
+            self.m_junctionMaze = None
+            self.m_junctionGraph = None
+        if self.m_adjacencyMaze is maze:
+            self.m_adjacencyMaze = None
+            self.m_adjacency = None
+        if self.m_weightedMaze is maze:
+            self.m_weightedMaze = None
+            self.m_weightedAdjacency = None
+
+    def openAdjacency(self, maze: Maze) -> dict:
+        """
+        @return {cell: [open neighbours]} (Maze.openNeighbours), built once per maze. The searches walk
+                it instead of asking the maze for each cell's neighbours and walls, which scans the
+                whole edge list every time.
+        """
+        if self.m_adjacencyMaze is not maze:
+            self.m_adjacency = maze.openNeighbours()
+            self.m_adjacencyMaze = maze
+        return self.m_adjacency
+
+    def weightedAdjacency(self, maze: Maze) -> dict:
+        """
+        @return {cell: [(neighbour, cost)]} over the open sides of every cell, where a step costs the
+                difference in weight of the two cells (as Maze.edgeWeight). Built once per maze.
+        """
+        if self.m_weightedMaze is not maze:
+            cells = maze.m_cells
+            adjacency = {}
+            maxCost = 0
+            # the edge list can hold copies of the cells without their weights, so use the maze's own
+            for cell, others in maze.openNeighbours().items():
+                a = cells.get((cell.getRow(), cell.getCol()), cell)
+                steps = []
+                for other in others:
+                    b = cells.get((other.getRow(), other.getCol()), other)
+                    cost = abs(a.getWeight() - b.getWeight())
+                    maxCost = max(maxCost, cost)
+                    steps.append((b, cost))
+                adjacency[a] = steps
+            self.m_weightedAdjacency = adjacency
+            self.m_maxStepCost = maxCost
+            self.m_weightedMaze = maze
+        return self.m_weightedAdjacency
+
+    def weightedSearch(self, maze: Maze, start: Coordinates, targets: List[Coordinates]):
+        """
+        Cheapest paths from start by cell weight, with Dial's algorithm: Dijkstra where the priority
+        queue is a ring of maxCost + 1 buckets, one per cost, which works because step costs are small
+        integers (0..4). O(E + maxCost * V). Stops once every target is settled.
+
+        @param maze: the maze we are working on.
+        @param start: the starting coordinate.
+        @param targets: the coordinates to find paths to.
+
+        @return (costs, predecessors) dictionaries for every cell reached, as multiTargetBfs.
+        """
+        adjacency = self.weightedAdjacency(maze)
+        ringSize = self.m_maxStepCost + 1
+        buckets = [deque() for _ in range(ringSize)]
+
+        costs: Dict[Coordinates, int] = {start: 0}
+        predecessors: Dict[Coordinates, Optional[Coordinates]] = {start: None}
+        remaining = set(targets)
+        settled = set()
+        buckets[0].append(start)
+        pending = 1
+        cost = 0
+
+        while pending and remaining:
+            bucket = buckets[cost % ringSize]
+            if not bucket:
+                cost += 1
+                continue
+            curr = bucket.popleft()
+            pending -= 1
+            if curr in settled or costs[curr] != cost:
+                continue
+            settled.add(curr)
+            remaining.discard(curr)
+            self.expanded += 1
+            for neighbor, step in adjacency.get(curr, []):
+                candidate = cost + step
+                if candidate < costs.get(neighbor, float('inf')):
+                    costs[neighbor] = candidate
+                    predecessors[neighbor] = curr
+                    buckets[candidate % ringSize].append(neighbor)
+                    pending += 1
+
+        return costs, predecessors
+
+    def pathCost(self, maze: Maze, path: List[Coordinates]) -> int:
+        """
+        @return The total weight cost of walking path.
+        """
+        cells = maze.m_cells
+        total = 0
+        for a, b in zip(path, path[1:]):
+            a = cells.get((a.getRow(), a.getCol()), a)
+            b = cells.get((b.getRow(), b.getCol()), b)
+            total += abs(a.getWeight() - b.getWeight())
+        return total
+
+    def shortestPath(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Finds a shortest path between start and goal with the chosen method.
+
+        @param maze: the maze we are working on.
+        @param start: the starting coordinate.
+        @param goal: the goal coordinate.
+
+        @return A list containing coordinates to go from the start to the goal, or [] if the goal
+                can't be reached.
+        """
+        if start == goal:
+            return [start]
+        oracle = self.treeOracle(maze)
+        if oracle is not None:
+            return oracle.path(start, goal)
+        if self.method == "bidirectional":
+            return self.bidirectionalBfs(maze, start, goal)
+        if self.method == "astar":
+            return self.aStar(maze, start, goal)
+        if self.method == "junction":
+            return self.junctionPath(maze, start, goal)
+        if self.method == "hierarchical":
+            return self.hierarchicalPath(maze, start, goal)
+        return self.bfs(maze, start, goal)
+
+    def hierarchicalPath(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Block level A* refined into cells. Abstract nodes and cells searched inside blocks count as expanded.
+        """
+        index = self.hierarchicalIndex(maze)
+        before = index.expanded
+        path = index.shortestPath(start, goal)
+        self.expanded += index.expanded - before
+        return path
+
+    def junctionPath(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Dijkstra on the contracted maze, expanded back into cells. Only junctions count as expanded.
+        """
+        graph = self.junctionGraph(maze)
+        before = graph.expanded
+        path = graph.shortestPath(start, goal)
+        self.expanded += graph.expanded - before
+        return path
+
+    def bfs(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Breadth first search from start that stops once goal is reached.
+        """
+        _, predecessors = self.multiTargetBfs(maze, start, [goal])
+        return self.tracePath(predecessors, goal) if goal in predecessors else []
+
+    def multiTargetBfs(self, maze: Maze, start: Coordinates, targets: List[Coordinates]):
+        """
+        Breadth first search from start that stops as soon as every target has been reached, so one
+        search gives the shortest paths to all of them.
+
+        @param maze: the maze we are working on.
+        @param start: the starting coordinate.
+        @param targets: the coordinates to find paths to.
+
+        @return (distances, predecessors) dictionaries for every cell reached. Use tracePath to get the
+                path to a target; targets that can't be reached are missing from both.
+        """
+        distances: Dict[Coordinates, int] = {start: 0}
+        predecessors: Dict[Coordinates, Optional[Coordinates]] = {start: None}
+        remaining = set(targets)
+        remaining.discard(start)
+        queue = deque([start])
+        adjacency = self.openAdjacency(maze)
+
+        # a cell's distance is final as soon as it is discovered, so stop once every target is found
+        while queue and remaining:
+            curr = queue.popleft()
+            self.expanded += 1
+            for neighbor in adjacency.get(curr, []):
+                if neighbor not in predecessors:
+                    distances[neighbor] = distances[curr] + 1
+                    predecessors[neighbor] = curr
+                    remaining.discard(neighbor)
+                    queue.append(neighbor)
+
+        return distances, predecessors
+
+    def bidirectionalBfs(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        Breadth first search from start and from goal at once, always growing the smaller frontier by
+        a whole level. The first level where the two searches touch holds a shortest path, and every
+        meeting on that level is checked to pick the shortest one.
+        """
+        forward: Dict[Coordinates, Optional[Coordinates]] = {start: None}
+        backward: Dict[Coordinates, Optional[Coordinates]] = {goal: None}
+        forwardDist = {start: 0}
+        backwardDist = {goal: 0}
+        forwardLevel = [start]
+        backwardLevel = [goal]
+        adjacency = self.openAdjacency(maze)
+
+        while forwardLevel and backwardLevel:
+            if len(forwardLevel) <= len(backwardLevel):
+                level, parents, dist, otherDist = forwardLevel, forward, forwardDist, backwardDist
+            else:
+                level, parents, dist, otherDist = backwardLevel, backward, backwardDist, forwardDist
+
+            nextLevel = []
+            meeting, meetingLength = None, float('inf')
+            for curr in level:
+                self.expanded += 1
+                for neighbor in adjacency.get(curr, []):
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = curr
+                    dist[neighbor] = dist[curr] + 1
+                    nextLevel.append(neighbor)
+                    if neighbor in otherDist and dist[neighbor] + otherDist[neighbor] < meetingLength:
+                        meeting, meetingLength = neighbor, dist[neighbor] + otherDist[neighbor]
+
+            if meeting is not None:
+                path = self.tracePath(forward, meeting)
+                curr = backward[meeting]
+                while curr is not None:
+                    path.append(curr)
+                    curr = backward[curr]
+                return path
+
+            if level is forwardLevel:
+                forwardLevel = nextLevel
+            else:
+                backwardLevel = nextLevel
+
+        return []
+
+    def aStar(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+        """
+        A* search. Every step costs 1 and moves one row or column, so the Manhattan distance never
+        overestimates and the first time the goal is taken off the queue its path is shortest. The
+        landmark bound never overestimates either, so the larger of the two is used when there is a
+        landmark index. Ties in f are broken towards cells nearer the goal.
+        """
+        goalRow, goalCol = goal.getRow(), goal.getCol()
+        landmarks = self.landmarkIndex(maze)
+        goalDistances = None
+        if landmarks is not None and landmarks.contains(goal):
+            goalDistances = landmarks.landmarkDistances(goal)
+
+        def heuristic(cell: Coordinates) -> int:
+            h = abs(cell.getRow() - goalRow) + abs(cell.getCol() - goalCol)
+            if goalDistances is not None and landmarks.contains(cell):
+                for x, y in zip(landmarks.landmarkDistances(cell), goalDistances):
+                    if x >= 0 and y >= 0 and abs(x - y) > h:
+                        h = abs(x - y)
+            return h
+
+        predecessors: Dict[Coordinates, Optional[Coordinates]] = {start: None}
+        dist = {start: 0}
+        closed = set()
+        order = 0
+        queue = [(heuristic(start), heuristic(start), order, start)]
+        adjacency = self.openAdjacency(maze)
+
+        while queue:
+            _, _, _, curr = heapq.heappop(queue)
+            if curr in closed:
+                continue
+            closed.add(curr)
+            self.expanded += 1
+            if curr == goal:
+                return self.tracePath(predecessors, goal)
+            for neighbor in adjacency.get(curr, []):
+                if neighbor in closed:
+                    continue
+                candidate = dist[curr] + 1
+                if candidate < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = candidate
+                    predecessors[neighbor] = curr
+                    order += 1
+                    h = heuristic(neighbor)
+                    heapq.heappush(queue, (candidate + h, h, order, neighbor))
+
+        return []
+
+    def tracePath(self, predecessors: Dict[Coordinates, Optional[Coordinates]], goal: Coordinates) -> List[Coordinates]:
+        """
+        @return The path from the root of a search tree to goal.
+        """
+        path = []
+        curr = goal
+        while curr is not None:
+            path.append(curr)
+            curr = predecessors[curr]
+        path.reverse()
+        return path
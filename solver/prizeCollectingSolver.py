@@ -0,0 +1,287 @@
+# -------------------------------------------------------------------
+# Chooses which items to collect and the route to collect them
+# together, maximising value - cells explored.
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+from knapsack.knapsack import Knapsack
+from solver.knapsackSolver import KnapsackSolver
+
+from typing import List
+
+
+class PrizeCollectingSolver(KnapsackSolver):
+    """
+    Unlike KnapsackSolver, which routes through whatever items the knapsack picked, this solver picks
+    the items and their order together. An item is only collected when its value pays for the detour.
+    Up to subsetLimit items, a DP over subsets of items finds the shortest route for every affordable
+    set on the precomputed distances. Above that, local search (insert / remove / 2-opt) is used
+    with the route length standing in for the cells explored. Either way the candidates are finally
+    ranked by their real number of unique cells, which is lower than the route length whenever the
+    route doubles back.
+
+    The distances and paths between the points come from KnapsackSolver.pointPaths, so the path search,
+    tree oracle, process pool and weighted paths options apply here just as they do to TaskC.
+    """
+
+    def __init__(self, knapsack: Knapsack, subsetLimit: int = 12, **routeOptions):
+        super().__init__(knapsack, **routeOptions)
+        self.m_subsetLimit = subsetLimit
+
+    def solveMaze(self, maze: Maze, entrance: Coordinates, exit: Coordinates):
+        """
+        Chooses the items and the route from entrance to exit that maximise value - cells explored,
+        without going over the knapsack capacity.
+
+        @param maze: the maze we are working on.
+        @param entrance: the starting coordinate.
+        @param exit: the end coordinate.
+        """
+        capacity = self.m_knapsack.capacity
+        # items that could be carried at all, as (location, weight, value)
+        items = [(loc, weight, value) for loc, weight, value in maze.itemTable().asList() if weight <= capacity]
+        n = len(items)
+
+        # point 0 is the entrance, 1..n the items and n + 1 the exit
+        points = [entrance] + [Coordinates(loc[0], loc[1]) for loc, _, _ in items] + [exit]
+        # the same searches (or tree, pool, weights) as KnapsackSolver.findRoute uses
+        self.openParallelSearch(maze)
+        try:
+            pointDistances, self.m_paths = self.pointPaths(maze, points)
+            knapsackCells = [tuple(cell) for cell in self.m_knapsack.optimalCells]
+            knapsackPath = self.findRoute(maze, entrance, exit, knapsackCells)
+        finally:
+            self.closeParallelSearch()
+
+        INF = float('inf')
+        distances = [[0] * (n + 2) for _ in range(n + 2)]
+        for i in range(n + 1):
+            for j in range(1, n + 2):
+                if i != j:
+                    distance = pointDistances[(points[i], points[j])]
+                    distances[i][j] = distance if distance >= 0 else INF
+        # nothing is searched from the exit, and the maze is undirected, so read it from the other end
+        for j in range(n + 1):
+            distances[n + 1][j] = distances[j][n + 1]
+
+        self.m_points = points
+        self.m_segments = {}
+
+        if n <= self.m_subsetLimit:
+            order = self.subsetOrder(items, distances, capacity)
+        else:
+            order = self.localSearchOrder(items, distances, capacity)
+
+        path = self.stitchRoute(order)
+        chosen = [items[i][0] for i in order]
+
+        # shortest routes that double back less can explore fewer cells, so never do worse than
+        # routing the knapsack's own choice the way KnapsackSolver does
+        knapsackReward = sum(maze.m_items[cell][1] for cell in knapsackCells) - len(set(knapsackPath))
+        if knapsackReward > sum(items[i][2] for i in order) - len(set(path)):
+            path, chosen = knapsackPath, knapsackCells
+
+        self.m_knapsack.optimalCells = chosen
+        self.m_knapsack.optimalWeight = sum(maze.m_items[cell][0] for cell in chosen)
+        self.m_knapsack.optimalValue = sum(maze.m_items[cell][1] for cell in chosen)
+
+        self.m_solverPath = path
+        self.m_entranceUsed = entrance
+        self.m_exitUsed = exit
+        self.m_cellsExplored = len(set(self.m_solverPath))
+        self.m_reward = self.reward()
+        if self.m_weightedPaths:
+            self.m_routeCost = self.m_pathSearch.pathCost(maze, self.m_solverPath)
+
+    def stitchRoute(self, order: List[int]) -> List[Coordinates]:
+        """
+        @return The full route from the entrance, through the items in order, to the exit.
+        """
+        stops = [0] + [i + 1 for i in order] + [len(self.m_points) - 1]
+        path = [self.m_points[0]]
+        for a, b in zip(stops, stops[1:]):
+            path.extend(self.m_paths[(self.m_points[a], self.m_points[b])][1:])
+        return path
+
+    def routeReward(self, items: list, order: List[int]) -> int:
+        """
+        @return value - unique cells explored for the route through the items in order.
+        """
+        stops = [0] + [i + 1 for i in order] + [len(self.m_points) - 1]
+        explored = set()
+        for a, b in zip(stops, stops[1:]):
+            if (a, b) not in self.m_segments:
+                self.m_segments[(a, b)] = set(self.m_paths[(self.m_points[a], self.m_points[b])])
+            explored |= self.m_segments[(a, b)]
+        return sum(items[i][2] for i in order) - len(explored)
+
+    def subsetOrder(self, items: list, distances: list, capacity: int) -> List[int]:
+        """
+        DP over subsets. best[mask][last] is the shortest walk from the entrance that visits exactly
+        the items in mask and ends at item last. Each set's shortest route to the exit is then
+        scored by its reward. O(2^n * n^2).
+
+        @param items: list of (location, weight, value)
+        @param distances: distance matrix, 0 = entrance, 1..n = items, n + 1 = exit
+        @param capacity: the knapsack capacity
+
+        @return The indices of the items to collect, in visiting order.
+        """
+        n = len(items)
+        exitIndex = n + 1
+        INF = float('inf')
+        full = 1 << n
+
+        weightOf = [0] * full
+        valueOf = [0] * full
+        for mask in range(1, full):
+            low = (mask & -mask).bit_length() - 1
+            weightOf[mask] = weightOf[mask & (mask - 1)] + items[low][1]
+            valueOf[mask] = valueOf[mask & (mask - 1)] + items[low][2]
+
+        best = [[INF] * n for _ in range(full)]
+        parent = [[-1] * n for _ in range(full)]
+        for j in range(n):
+            best[1 << j][j] = distances[0][j + 1]
+
+        # masks only ever grow, so increasing order handles every predecessor first
+        for mask in range(1, full):
+            if weightOf[mask] > capacity:
+                continue
+            row = best[mask]
+            for last in range(n):
+                dist = row[last]
+                if dist == INF:
+                    continue
+                for nxt in range(n):
+                    bit = 1 << nxt
+                    if mask & bit or weightOf[mask | bit] > capacity:
+                        continue
+                    candidate = dist + distances[last + 1][nxt + 1]
+                    if candidate < best[mask | bit][nxt]:
+                        best[mask | bit][nxt] = candidate
+                        parent[mask | bit][nxt] = last
+
+        # collecting nothing and walking straight out
+        bestOrder = []
+        bestReward = self.routeReward(items, [])
+
+        # every affordable set, along its shortest route, scored by the cells it really explores
+        for mask in range(1, full):
+            if weightOf[mask] > capacity:
+                continue
+            last = min(range(n), key=lambda j: best[mask][j] + distances[j + 1][exitIndex])
+            if best[mask][last] == INF:
+                continue
+
+            order = []
+            visited = mask
+            while last != -1:
+                order.append(last)
+                visited, last = visited ^ (1 << last), parent[visited][last]
+            order.reverse()
+
+            reward = self.routeReward(items, order)
+            if reward > bestReward:
+                bestOrder, bestReward = order, reward
+
+        return bestOrder
+
+    def localSearchOrder(self, items: list, distances: list, capacity: int) -> List[int]:
+        """
+        Local search for many items. Starting from both an empty route and the knapsack's own choice,
+        repeatedly applies the best improving move until none is left:
+            insert  - add an unvisited item where it lengthens the route least
+            remove  - drop an item whose detour costs more than its value
+            2-opt   - reverse a stretch of the route
+        and keeps the better of the two results.
+
+        @param items: list of (location, weight, value)
+        @param distances: distance matrix, 0 = entrance, 1..n = items, n + 1 = exit
+        @param capacity: the knapsack capacity
+
+        @return The indices of the items to collect, in visiting order.
+        """
+        index = {item[0]: i for i, item in enumerate(items)}
+        seeds = [[], [index[tuple(cell)] for cell in self.m_knapsack.optimalCells if tuple(cell) in index]]
+
+        bestOrder, bestReward = [], float('-inf')
+        for seed in seeds:
+            order = self.improveRoute(items, distances, capacity, self.cheapestInsertion(seed, distances))
+            reward = self.routeReward(items, order)
+            if reward > bestReward:
+                bestOrder, bestReward = order, reward
+
+        return bestOrder
+
+    def cheapestInsertion(self, chosen: List[int], distances: list) -> List[int]:
+        """
+        @return The items in chosen, ordered by inserting each where it lengthens the route least.
+        """
+        exitIndex = len(distances) - 1
+        order = []
+        for item in chosen:
+            stops = [0] + [i + 1 for i in order] + [exitIndex]
+            position = min(range(len(stops) - 1),
+                           key=lambda p: distances[stops[p]][item + 1] + distances[item + 1][stops[p + 1]]
+                           - distances[stops[p]][stops[p + 1]])
+            order.insert(position, item)
+        return order
+
+    def improveRoute(self, items: list, distances: list, capacity: int, order: List[int]) -> List[int]:
+        """
+        Applies the best improving insert, remove or 2-opt move until there is none.
+
+        @return The improved visiting order.
+        """
+        n = len(items)
+        exitIndex = n + 1
+        weight = sum(items[i][1] for i in order)
+
+        while True:
+            stops = [0] + [i + 1 for i in order] + [exitIndex]
+            bestGain, bestMove = 0, None
+
+            # insert
+            inRoute = set(order)
+            for item in range(n):
+                if item in inRoute or weight + items[item][1] > capacity:
+                    continue
+                for p in range(len(stops) - 1):
+                    a, b = stops[p], stops[p + 1]
+                    gain = items[item][2] - (distances[a][item + 1] + distances[item + 1][b] - distances[a][b])
+                    if gain > bestGain:
+                        bestGain, bestMove = gain, ('insert', item, p)
+
+            # remove
+            for p in range(1, len(stops) - 1):
+                a, x, b = stops[p - 1], stops[p], stops[p + 1]
+                gain = distances[a][x] + distances[x][b] - distances[a][b] - items[x - 1][2]
+                if gain > bestGain:
+                    bestGain, bestMove = gain, ('remove', p - 1, None)
+
+            # 2-opt: reverse order[i..j]
+            for i in range(1, len(stops) - 2):
+                for j in range(i + 1, len(stops) - 1):
+                    a, b, c, d = stops[i - 1], stops[i], stops[j], stops[j + 1]
+                    gain = distances[a][b] + distances[c][d] - distances[a][c] - distances[b][d]
+                    if gain > bestGain:
+                        bestGain, bestMove = gain, ('reverse', i - 1, j - 1)
+
+            if bestMove is None:
+                return order
+
+            move, x, y = bestMove
+            if move == 'insert':
+                order.insert(y, x)
+                weight += items[x][1]
+            elif move == 'remove':
+                weight -= items[order[x]][1]
+                order.pop(x)
+            else:
+                order[x:y + 1] = reversed(order[x:y + 1])
@@ -11,16 +11,19 @@ from maze.util import Coordinates
 from maze.maze import Maze
 
 from knapsack.knapsack import Knapsack
+from knapsack.incrementalKnapsack import IncrementalKnapsack
+from solver.pathSearch import PathSearch
 from itertools import permutations
 
-from typing import List, Dict, Optional
+from typing import List
 
 import math
 # import time
 
 
 class TaskDSolver:
-    def __init__(self, knapsack:Knapsack):
+    def __init__(self, knapsack:Knapsack, pathSearch:str = "bfs", useTreeOracle:bool = True,
+                 landmarks:int = 0, landmarkDir:str = None, blockSize:int = 16):
         self.m_solverPath: List[Coordinates] = []
         self.m_cellsExplored = 0 # count of UNIQUE cells visited. i.e. final count should equal len(set(self.m_solverPath))
         self.m_entranceUsed = None
@@ -28,6 +31,9 @@ class TaskDSolver:
         self.m_knapsack = knapsack
         self.m_value = 0
         self.m_reward = float('-inf') # initial reward should be terrible
+        # shortest path search used for each segment of the route (see PathSearch for the methods),
+        # answered from the tree instead when the maze is perfect
+        self.m_pathSearch = PathSearch(pathSearch, useTreeOracle, landmarks, landmarkDir, blockSize)
 
         # you may which to add more parameters here, such as probabilities, etc
         # you may update these parameters using the Maze object in SolveMaze
@@ -64,9 +70,9 @@ class TaskDSolver:
         # get the number of items in the maze from the paramaters
         items_in_maze = maze.m_itemParams[0]
         # calculate total weight in maze form item list
-        maze_item_weight = sum(weight_value[0] for weight_value in maze.m_items.values())
+        maze_item_weight = maze.itemTable().totalWeight()
         # calculate total value in maze from item list
-        maze_item_value = sum(weight_value[1] for weight_value in maze.m_items.values())
+        maze_item_value = maze.itemTable().totalValue()
 
         # set up some intitial values for the TaskDSolver object. As you calculate a solution, you will need
         # to change the solver path and recalculate your reward.
@@ -76,7 +82,9 @@ class TaskDSolver:
         self.m_cellsExplored = len(set(self.m_solverPath))
         self.m_reward = self.reward()
         
-        self.foundTreasures: List[tuple[Coordinates, int, int]] = [] #coords, value, weight
+        self.foundTreasures: List[tuple[Coordinates, int, int]] = [] #coords, weight, value
+        # best selection of the treasures found so far, updated as each one is found
+        self.m_explorerKnapsack = IncrementalKnapsack(self.m_knapsack.capacity)
 
         # Centre point of the maze
         centre = Coordinates(maze.rowNum() // 2, maze.colNum() // 2)    
@@ -110,24 +118,28 @@ class TaskDSolver:
         ]
 
         for i, (start, end) in enumerate(pathSegments):
-            segment = self.bfs(maze, start, end)
+            segment = self.m_pathSearch.shortestPath(maze, start, end)
             if i == 0:
                 self.m_solverPath.extend(segment)
             else:
                 self.m_solverPath.extend(segment[1:]) #if it's not the first segment then remove the head of that segment 
 
-        # Checking if the cell contains a treasure
-        for cell in set(self.m_solverPath):
+        # Checking if the cell contains a treasure, in the order the cells are first visited
+        visitedCells = set()
+        for cell in self.m_solverPath:
             loc = (cell.getRow(), cell.getCol())
+            if loc in visitedCells:
+                continue
+            visitedCells.add(loc)
             item = maze.m_items.get(loc)
 
             if item: 
-                value, weight = item       
-                toBeAdded = (loc, value, weight)
-                self.foundTreasures.append(toBeAdded)
+                weight, value = item
+                self.foundTreasures.append((loc, weight, value))
+                self.m_explorerKnapsack.addItem(loc, weight, value)
         
-        # Dynamic knapsack to choose which treasure to pick 
-        self.m_knapsack.optimalCells, self.m_knapsack.optimalWeight, self.m_knapsack.optimalValue = self.dynamicKnapsack(self.foundTreasures, self.m_knapsack.capacity, len(self.foundTreasures))
+        # Choose which treasure to pick from everything found along the way
+        self.m_knapsack.optimalCells, self.m_knapsack.optimalWeight, self.m_knapsack.optimalValue = self.m_explorerKnapsack.best()
 
         # Recalculate the reward
         self.m_cellsExplored = len(set(self.m_solverPath))
@@ -172,97 +184,3 @@ class TaskDSolver:
                 )
 
         print("Path is legal.")
-
-    def bfs(self, maze: Maze, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
-        """
-        Finds the shortest path between start and goal coordinate using breadth first search
-
-        @param maze: the maze we are working on.
-        @param start: the starting coordinate.
-        @param goal: the goal coordinate.
-
-        @return A list containing coordinates to go from the start to the goal.
-        """
-
-        if start == goal:
-            return [start]
-
-        visited = set()
-        queue = [start]
-        predecessors: Dict[Coordinates, Optional[Coordinates]] = {start: None}
-
-        while queue:
-            curr = queue.pop(0)
-
-            if curr == goal:
-                # Reconstruct path from goal to start
-                path = []
-                while curr is not None:
-                    path.append(curr)
-                    curr = predecessors[curr]
-                return list(reversed(path))
-
-            visited.add(curr)
-
-            for neighbor in maze.neighbours(curr):
-                if neighbor not in visited and neighbor not in predecessors:
-                    if not maze.hasWall(curr, neighbor):
-                        queue.append(neighbor)
-                        predecessors[neighbor] = curr
-
-        # If goal is unreachable (shouldn’t happen in a fully connected maze)
-        return []
-    
-    def dynamicKnapsack(self, items: list, capacity: int, num_items: int):
-        """
-        Dynamic 0/1 Knapsack that saves the dynamic programming table as a csv.
-
-        @param items: list of (name, weight, value)
-        @param capacity: current remaining knapsack capacity
-        @param num_items: number of items still being considered
-        @param filename: save name for csv of table (used for testing)
-        """
-        # Initialize DP table with None
-        dp = [[None] * (capacity + 1) for _ in range(num_items + 1)]
-        # first row is all 0s
-        dp[0] = [0] * (capacity + 1)
-
-        selected_items, selected_weight, max_value = [], 0, 0
-    
-        # Any of "items[i - 1]" is from converting the (kind of?) 1-indexed of the table to 0-indexed of items
-        # topDown is a Memory Function
-        def topDown(i: int, c: int): 
-            if dp[i][c] is not None: 
-                return dp[i][c]
-    
-            if i == 0 or c == 0:
-                output = 0
-            elif items[i - 1][1] > c:
-                output = topDown(i-1, c)
-            else:
-                inc = topDown(i - 1, c - items[i - 1][1]) + items[i - 1][2]
-                exc = topDown(i - 1, c)
-                output = max(inc, exc)
-
-            dp[i][c] = output; 
-            return output
-        
-        max_value = topDown(num_items, capacity)    
-
-        # Backtracking
-        i = num_items
-        c = capacity
-        
-        while i > 0 and c > 0:
-            # If the value at this cell is not the same as the one right above it in the table
-            if dp[i][c] != dp[i-1][c]:
-                selected_items.append(items[i - 1][0])  # Add location
-                selected_weight += items[i - 1][1]  # Add weight
-                
-                # Subtract weight from remaining capacity
-                c -= items[i - 1][1]
-            
-            # Move to the previous item
-            i -= 1
-
-        return selected_items, selected_weight, max_value
\ No newline at end of file
@@ -0,0 +1,56 @@
+# -------------------------------------------------------------------
+# Regression tests for the prize collecting solver.
+# Run from the top folder with: python -m unittest testing/test_prizeCollectingSolver.py
+#
+# __copyright__ = 'Copyright 2025, RMIT University'
+# -------------------------------------------------------------------
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maze.util import Coordinates
+from maze.maze import Maze
+
+from knapsack.knapsack import Knapsack
+from generator.mazeGenerator import MazeGenerator
+from solver.knapsackSolver import KnapsackSolver
+from solver.prizeCollectingSolver import PrizeCollectingSolver
+
+
+def solve(solverClass, seed: int, numItems: int, capacity: int):
+    """
+    Generates a 10 x 10 maze from seed, solves its knapsack and then the maze with solverClass.
+
+    @return (the solver, the knapsack)
+    """
+    random.seed(seed)
+    maze = Maze(10, 10, [numItems, 5, 5])
+    maze.addEntrance(Coordinates(3, -1))
+    maze.addExit(Coordinates(-1, 3))
+    MazeGenerator(15).generateMaze(maze)
+
+    knapsack = Knapsack(capacity, "dynamic")
+    knapsack.solveKnapsack(maze, None)
+    solver = solverClass(knapsack)
+    solver.solveMaze(maze, maze.getEntrances()[0], maze.getExits()[0])
+    return solver, knapsack
+
+
+class PrizeCollectingSolverTest(unittest.TestCase):
+
+    def testRewardAtLeastTaskCWithManyItems(self):
+        # the knapsack takes all 14 items, more than KnapsackSolver orders by permutations
+        taskC, knapsack = solve(KnapsackSolver, 1, 14, 40)
+        self.assertGreater(len(knapsack.optimalCells), 8)
+
+        prize, _ = solve(PrizeCollectingSolver, 1, 14, 40)
+        self.assertGreaterEqual(prize.m_reward, taskC.m_reward)
+        self.assertEqual(prize.m_reward, prize.m_knapsack.optimalValue - len(set(prize.m_solverPath)))
+
+
+if __name__ == '__main__':
+    unittest.main()